@@ -0,0 +1,321 @@
+"""
+Run the Advent of Code 2018 solutions from a single entry point.
+
+    python aoc.py run                     # every day, both parts
+    python aoc.py run 1 5-7 --part 2      # selected days, part 2 only
+    python aoc.py run 3 --input my3.data  # a single day with another input
+    python aoc.py run --jobs 4            # at most 4 worker processes
+    python aoc.py run --import-profile    # report import times instead
+
+Each part runs in a worker process, so independent days run in parallel.
+Every module exposes solve_part1(filename) and solve_part2(filename), which
+the runner imports and calls; wall time and CPU time are reported per part.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+import argparse
+import importlib
+import os
+import sys
+import time
+import traceback
+
+# Registry of day number to solver module. Modules are only imported, by
+# load(), when their day is run: some pull in heavy dependencies (day25 uses
+# networkx) that a run of day1 shouldn't pay for.
+DAYS = {day: f"day{day}" for day in range(1, 26)}
+
+# Maximum time (seconds) the runner plus a day's module may take to import.
+IMPORT_BUDGET = 0.2
+
+# Number of heaviest dependencies listed per module in an import profile.
+IMPORT_DETAIL = 3
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class Outcome:
+    day: int
+    part: int
+    answer: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+    def __str__(self):
+        heading = (
+            f"Day {self.day:>2} part {self.part} "
+            f"[{self.wall:8.3f}s wall {self.cpu:8.3f}s cpu]"
+        )
+        if self.error is not None:
+            return f"{heading}: ERROR {self.error}"
+
+        answer = str(self.answer)
+        if "\n" in answer:
+            return f"{heading}:\n{answer}"
+
+        return f"{heading}: {answer}"
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    cumulative: float = 0.0
+    heaviest: List[Tuple[float, str]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def __str__(self):
+        heading = f"{self.module:<8} {self.cumulative * 1000:8.1f}ms"
+        if self.error is not None:
+            return f"{heading}  ERROR {self.error}"
+
+        detail = ", ".join(
+            f"{name} {seconds * 1000:.1f}ms" for (seconds, name) in self.heaviest
+        )
+        return f"{heading}  ({detail})" if detail else heading
+
+
+def load(day):
+    """
+    Import the solver module for a day.
+    """
+    return importlib.import_module(DAYS[day])
+
+
+def parse_importtime(report, module):
+    """
+    Summarise the output of python -X importtime for the import of module.
+    Entries are listed as each import completes, with nesting shown by
+    indentation, so the module's dependencies are the more deeply indented
+    lines just above its own.
+    """
+    entries = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        (own, cumulative, name) = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # the header line
+        depth = len(name) - len(name.lstrip())
+        entries.append((depth, int(own) / 1e6, int(cumulative) / 1e6, name.strip()))
+
+    profile = ImportProfile(module)
+    for index in range(len(entries) - 1, -1, -1):
+        (depth, _, cumulative, name) = entries[index]
+        if name == module:
+            break
+    else:
+        return profile
+
+    profile.cumulative = cumulative
+    dependencies = []
+    for (dep_depth, own, _, name) in reversed(entries[:index]):
+        if dep_depth <= depth:
+            break
+        dependencies.append((own, name))
+
+    profile.heaviest = sorted(dependencies, reverse=True)[:IMPORT_DETAIL]
+
+    return profile
+
+
+def import_profile(module, after=None):
+    """
+    Import module in a fresh interpreter, so that nothing is cached, and
+    profile it. If after is given, that module is imported first, and
+    anything it pulls in isn't counted against module.
+    """
+    # Imported here rather than at the top, as only profiling needs it.
+    import subprocess
+
+    statement = f"import {module}" if after is None else f"import {after}, {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=HERE, capture_output=True, text=True
+    )
+    profile = parse_importtime(proc.stderr, module)
+    if proc.returncode != 0:
+        lines = [
+            line for line in proc.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        profile.error = lines[-1] if lines else f"exit code {proc.returncode}"
+
+    return profile
+
+
+def profile_imports(days, budget=IMPORT_BUDGET, out=sys.stdout):
+    """
+    Print the import time of the runner and of each day's module on top of
+    it, as a worker would see it. Return True if the startup cost of every
+    day (runner plus module) is within the budget.
+    """
+    runner = import_profile("aoc")
+    print(runner, file=out, flush=True)
+
+    within = True
+    for day in days:
+        profile = import_profile(DAYS[day], after="aoc")
+        startup = runner.cumulative + profile.cumulative
+        line = str(profile)
+        if profile.error is not None:
+            within = False
+        elif startup > budget:
+            line += f"  OVER BUDGET ({startup * 1000:.1f}ms > {budget * 1000:.1f}ms)"
+            within = False
+        print(line, file=out, flush=True)
+
+    return within
+
+
+def cpu_time():
+    """
+    CPU time used by this process and any children it has waited for. Some
+    solutions fan out over their own process pool, which would otherwise be
+    missed.
+    """
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+
+def run_part(day, part, filename=None, required=True):
+    """
+    Import a day's module and run one of its parts. Errors are caught and
+    reported in the outcome so that one broken day doesn't stop the others.
+    A part the module doesn't define is an error if required, and is
+    otherwise marked skipped (day25 has no part 2).
+    """
+    outcome = Outcome(day, part)
+    try:
+        module = load(day)
+        solver = getattr(module, f"solve_part{part}", None)
+        if solver is None:
+            if required:
+                outcome.error = f"{DAYS[day]} has no part {part}"
+            else:
+                outcome.skipped = True
+            return outcome
+
+        args = [] if filename is None else [filename]
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+        outcome.answer = solver(*args)
+        outcome.cpu = cpu_time() - cpu_start
+        outcome.wall = time.perf_counter() - wall_start
+    except Exception as exc:
+        outcome.error = "".join(
+            traceback.format_exception_only(type(exc), exc)
+        ).strip()
+
+    return outcome
+
+
+def parse_days(specs):
+    """
+    Expand day specifications like ["1", "5-7"] into a sorted list of days.
+    No specifications means every day.
+    """
+    if not specs:
+        return sorted(DAYS)
+
+    days = set()
+    for spec in specs:
+        try:
+            if "-" in spec:
+                (first, last) = spec.split("-")
+                days.update(range(int(first), int(last) + 1))
+            else:
+                days.add(int(spec))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad day: {spec}")
+
+    unknown = days - set(DAYS)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"no such day: {', '.join(str(d) for d in sorted(unknown))}"
+        )
+
+    return sorted(days)
+
+
+def run(days, parts, jobs=None, filename=None, out=sys.stdout,
+        required=True):
+    """
+    Run the given parts of the given days, printing outcomes in day order.
+    With jobs == 1 everything runs in this process. Returns the outcomes.
+    Unless required, parts a module doesn't define are skipped silently.
+    """
+    tasks = [(day, part) for day in days for part in parts]
+
+    if jobs == 1:
+        outcomes = []
+        for (day, part) in tasks:
+            outcome = run_part(day, part, filename, required)
+            if not outcome.skipped:
+                print(outcome, file=out, flush=True)
+            outcomes.append(outcome)
+        return outcomes
+
+    # Imported here rather than at the top, as it's relatively slow to load
+    # and isn't needed for a single job.
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(run_part, day, part, filename, required)
+            for (day, part) in tasks
+        ]
+        outcomes = []
+        for future in futures:
+            outcome = future.result()
+            if not outcome.skipped:
+                print(outcome, file=out, flush=True)
+            outcomes.append(outcome)
+
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="run one or more days")
+    runner.add_argument("days", nargs="*",
+                        help="days to run, e.g. 1 5-7 (default: all)")
+    runner.add_argument("--part", type=int, choices=[1, 2],
+                        help="run only this part")
+    runner.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    runner.add_argument("--input", help="input file (single day only)")
+    runner.add_argument("--import-profile", action="store_true",
+                        help="report import times instead of running")
+    runner.add_argument("--import-budget", type=float, default=IMPORT_BUDGET,
+                        help="maximum startup time in seconds per day")
+
+    args = parser.parse_args(argv)
+
+    try:
+        days = parse_days(args.days)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    if args.input is not None and len(days) != 1:
+        parser.error("--input needs exactly one day")
+
+    if args.import_profile:
+        return 0 if profile_imports(days, args.import_budget) else 1
+
+    # Only a part asked for with --part has to exist.
+    parts = [args.part] if args.part else [1, 2]
+
+    outcomes = run(
+        days, parts, args.jobs, args.input, required=args.part is not None
+    )
+
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+"""
+Benchmark harness for the Advent of Code 2018 solutions.
+
+Each case splits a day into a parse phase and a solve phase, timed separately
+over the bundled data files, and records the peak memory allocated while
+doing both. Cases can also be run at synthetic scales (e.g. day9 with 10x the
+marbles) to see how an algorithm behaves as its input grows.
+
+Results are compared against a stored JSON baseline so that a slowdown fails
+the run:
+
+    python bench.py                     # run all cases, compare to baseline
+    python bench.py day5 day9           # run a subset
+    python bench.py day9 --scale 100    # run at a given scale only
+    python bench.py --update            # record a new baseline
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import day1
+import day2
+import day3
+import day4
+import day5
+import day6
+import day7
+import day8
+import day9
+import day10
+import day11
+import day13
+import day14
+import day15
+import day16
+import day17
+import day18
+import day19
+import day20
+import day21
+import day22
+import day23
+import day24
+
+BASELINE = "bench_baseline.json"
+TOLERANCE = 0.25
+
+# Differences smaller than this (seconds) are treated as timer noise.
+MIN_DELTA = 0.005
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case. parse(scale) builds the input for the given scale and
+    solve(parsed) runs the algorithm over it. solve must not rely on state
+    left behind by a previous run, as each repeat re-parses.
+    """
+    name: str
+    parse: Callable[[int], Any]
+    solve: Callable[[Any], Any]
+    scales: Tuple[int, ...] = (1,)
+
+
+@dataclass
+class Result:
+    case: str
+    scale: int
+    parse: float
+    solve: float
+    peak: int
+
+    def key(self):
+        return f"{self.case}@{self.scale}"
+
+
+def day3_parse(scale):
+    """
+    Replicate the claims side by side, so that the fabric grows but the
+    density of overlaps stays the same.
+    """
+    claims = day3.parse_data(day3.read_data())
+    result = []
+    for copy in range(scale):
+        for claim in claims:
+            result.append(day3.Claim(
+                id=claim.id + copy * len(claims),
+                origin=(claim.origin[0] + copy * 1000, claim.origin[1]),
+                size=claim.size
+            ))
+
+    return result
+
+
+def day3_solve(claims, backend=day3.Fabric):
+    fabric = backend()
+    return (day3.part1(fabric, claims), len(day3.part2(fabric, claims)))
+
+
+def day4_parse(scale):
+    """
+    Replay the log over consecutive years.
+    """
+    lines = day4.read_data()
+    data = []
+    for year in range(1518, 1518 + scale):
+        data.extend(line.replace("[1518-", f"[{year}-") for line in lines)
+
+    return day4.GuardRota.from_list(data)
+
+
+def day4_stream_parse(scale):
+    """
+    The multi-year log, shuffled, in batches of 100 lines.
+    """
+    lines = []
+    for year in range(1518, 1518 + scale):
+        lines.extend(
+            line.replace("[1518-", f"[{year}-") for line in day4.read_data()
+        )
+    random.Random(4).shuffle(lines)
+
+    return [lines[start:start + 100] for start in range(0, len(lines), 100)]
+
+
+def day4_stream_solve(batches):
+    rota = day4.StreamingRota()
+    for batch in batches:
+        rota.feed(batch)
+        answers = (rota.part1(), rota.part2())
+
+    return answers
+
+
+def day5_solve(data):
+    polymer = day5.Polymer(data)
+    polymer.reduce_full()
+    return (polymer.size(), day5.shortest_removal(day5.Polymer(data)))
+
+
+def day6_solve(area):
+    areas = area.voronoi().areas()
+    return (areas.most_common()[0][1], area.safe_region(10000))
+
+
+def day7_solve(edges):
+    dag = day7.DAG(edges)
+    return (day7.pvl(dag.stepping_order()), dag.stepping_order_p2(5)[1])
+
+
+def day7_generated_parse(scale):
+    """
+    A random layered DAG of 1000 * scale tasks, each depending on a few of
+    the 50 before it, with costs of 1-100 seconds.
+    """
+    rng = random.Random(7)
+    names = [f"T{i:06}" for i in range(1000 * scale)]
+    edges = [
+        (names[j], names[i])
+        for i in range(1, len(names))
+        for j in rng.sample(range(max(0, i - 50), i), min(i, 3))
+    ]
+    costs = {name: rng.randint(1, 100) for name in names}
+
+    return (day7.DAG(edges), costs.__getitem__)
+
+
+def day7_generated_solve(parsed):
+    (dag, cost) = parsed
+    return (dag.lower_bound(8, cost),) + tuple(
+        dag.stepping_order_p2(8, cost, policy)[1]
+        for policy in (
+            day7.Alphabetical(), day7.LongestFirst(), day7.CriticalPathFirst()
+        )
+    )
+
+
+def day8_parse(scale):
+    """
+    Hang scale copies of the tree off a new root with a single metadata
+    entry.
+    """
+    with open("data/input8.data") as f:
+        tree = [int(item) for item in f.read().split(" ")]
+
+    if scale == 1:
+        return tree
+
+    return [scale, 1] + tree * scale + [1]
+
+
+def day8_solve(data):
+    tree = day8.FlatTree(data)
+    return (tree.meta_sum(), tree.value())
+
+
+def day11_solve(task):
+    (grid, filter_size) = task
+    return grid.find_max(filter_size)
+
+
+def day14_solve(recipes):
+    lab = day14.ChocolateLab("765071")
+    while len(lab.recipes) < recipes:
+        lab.advance()
+
+    return len(lab.recipes)
+
+
+def day15_solve(lines):
+    cave = day15.Cave.from_data(lines)
+    turns = 1
+    while True:
+        game_over, _, _ = cave.execute_turn()
+        if game_over:
+            return (turns - 1) * cave.hitpoints_remaining()
+        turns += 1
+
+
+def day16_solve(samples):
+    count = 0
+    for before, instruction, after in samples:
+        if len(day16.analyse_sample(before, instruction, after)) >= 3:
+            count += 1
+
+    return (count, len(day16.find_opcodes(samples)))
+
+
+def day18_solve(lines):
+    forest = day18.Forest.from_data(lines)
+    for _ in range(10):
+        forest.generate()
+
+    return forest.counter[day18.TREE] * forest.counter[day18.LUMBER]
+
+
+def day22_solve(parsed):
+    (depth, target) = parsed
+    day22.region.cache_clear()
+    return day22.risk_level(target, depth)
+
+
+def day23_solve(parsed):
+    (strongest, bots) = parsed
+    return (
+        day23.in_range_of_strongest(strongest, bots),
+        day23.closest_best_point(bots)
+    )
+
+
+CASES = [
+    Case(
+        "day1",
+        lambda scale: day1.read_data() * scale,
+        lambda data: (sum(data), day1.part2(data)),
+        (1, 10)
+    ),
+    Case(
+        "day2",
+        lambda scale: day2.read_data() * scale,
+        lambda data: (day2.part1(data), day2.part2(data)),
+        (1, 2, 4)
+    ),
+    Case("day3", day3_parse, day3_solve, (1, 4)),
+    Case(
+        "day3-dense",
+        day3_parse,
+        lambda claims: day3_solve(claims, day3.DenseFabric),
+        (1, 4)
+    ),
+    Case(
+        "day3-sweep",
+        day3_parse,
+        lambda claims: day3_solve(claims, day3.SweepFabric),
+        (1, 4)
+    ),
+    Case("day4", day4_parse, lambda rota: (rota.part1(), rota.part2()), (1, 10)),
+    Case("day4-stream", day4_stream_parse, day4_stream_solve, (1, 10)),
+    Case("day5", lambda scale: day5.read_data() * scale, day5_solve, (1, 2)),
+    Case(
+        "day6",
+        lambda scale: day6.Area.from_coordset(day6.read_data()),
+        day6_solve
+    ),
+    Case(
+        "day7",
+        lambda scale: day7.parse_data(day7.read_data()),
+        day7_solve
+    ),
+    Case(
+        "day7-generated",
+        day7_generated_parse,
+        day7_generated_solve,
+        (1, 10)
+    ),
+    Case("day8", day8_parse, day8_solve, (1, 10, 100)),
+    Case("day8-stream", day8_parse, day8.evaluate, (1, 10, 100)),
+    Case(
+        "day9",
+        lambda scale: (430, 71588 * scale),
+        lambda game: day9.play(*game),
+        (1, 10)
+    ),
+    Case(
+        "day10",
+        lambda scale: day10.read_data(),
+        lambda lines: day10.find_min_bbox(lines)[0]
+    ),
+    Case(
+        "day11",
+        lambda scale: (day11.Grid(7803), scale),
+        day11_solve,
+        (1, 3, 9)
+    ),
+    Case(
+        "day13",
+        lambda scale: day13.read_data(),
+        lambda lines: day13.first_collision(lines)[0]
+    ),
+    Case("day14", lambda scale: 10_000 * scale, day14_solve, (1, 10, 100)),
+    Case("day15", lambda scale: day15.read_data(), day15_solve),
+    Case(
+        "day16",
+        lambda scale: day16.parse_data(day16.read_data()),
+        day16_solve
+    ),
+    Case(
+        "day17",
+        lambda scale: day17.read_data(),
+        lambda data: len(day17.flood(data).settled)
+    ),
+    Case("day18", lambda scale: day18.read_data(), day18_solve),
+    Case(
+        "day19",
+        lambda scale: day19.parse_data(day19.read_data()),
+        lambda parsed: day19.run(*parsed, [0, 0, 0, 0, 0, 0])[0]
+    ),
+    Case(
+        "day20",
+        lambda scale: day20.read_data(),
+        lambda pattern: max(day20.room_distances(pattern).values())
+    ),
+    Case(
+        "day21",
+        lambda scale: day21.parse_data(day21.read_data()),
+        lambda parsed: next(day21.exit_checks(*parsed))
+    ),
+    Case("day22", lambda scale: day22.read_data(), day22_solve),
+    Case(
+        "day23",
+        lambda scale: day23.parse_data(day23.read_data()),
+        day23_solve
+    ),
+    Case(
+        "day24",
+        lambda scale: day24.parse_data(day24.read_data()),
+        lambda parsed: day24.battle(*parsed)
+    ),
+]
+
+
+def measure(case, scale, repeat=1):
+    """
+    Time the parse and solve phases of a case (best of repeat runs), then run
+    it once more under tracemalloc to find the peak memory use.
+    """
+    best_parse = None
+    best_solve = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = case.parse(scale)
+        parsed_at = time.perf_counter()
+        case.solve(parsed)
+        solved_at = time.perf_counter()
+
+        if best_parse is None or parsed_at - start < best_parse:
+            best_parse = parsed_at - start
+        if best_solve is None or solved_at - parsed_at < best_solve:
+            best_solve = solved_at - parsed_at
+
+    tracemalloc.start()
+    try:
+        case.solve(case.parse(scale))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return Result(case.name, scale, best_parse, best_solve, peak)
+
+
+def regressions(result, baseline, tolerance=TOLERANCE):
+    """
+    Compare a result with its baseline entry, if any. Return a list of
+    human-readable descriptions of each metric that got worse by more than
+    the tolerance.
+    """
+    previous = baseline.get(result.key())
+    if previous is None:
+        return []
+
+    found = []
+    for metric in ["parse", "solve"]:
+        was = previous[metric]
+        now = getattr(result, metric)
+        if now - was > MIN_DELTA and now > was * (1 + tolerance):
+            found.append(f"{metric} {was:.3f}s -> {now:.3f}s")
+
+    if result.peak > previous["peak"] * (1 + tolerance):
+        found.append(f"peak {previous['peak']} -> {result.peak} bytes")
+
+    return found
+
+
+def load_baseline(filename=BASELINE):
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, filename=BASELINE):
+    """
+    Merge results into the stored baseline, keeping entries for cases that
+    weren't run this time.
+    """
+    baseline = load_baseline(filename)
+    for result in results:
+        entry = asdict(result)
+        del entry["case"], entry["scale"]
+        baseline[result.key()] = entry
+
+    with open(filename, "w") as f:
+        json.dump(baseline, f, indent=4, sort_keys=True)
+
+
+def select(names: Optional[List[str]]) -> List[Case]:
+    if not names:
+        return CASES
+
+    by_name: Dict[str, Case] = {case.name: case for case in CASES}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(unknown)}")
+
+    return [by_name[name] for name in names]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("cases", nargs="*", help="cases to run, e.g. day9")
+    parser.add_argument("--scale", type=int, action="append",
+                        help="run at this scale instead of the case defaults")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update", action="store_true",
+                        help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    failed = False
+
+    print(f"{'case':<16}{'parse (s)':>12}{'solve (s)':>12}{'peak (KiB)':>14}")
+    for case in select(args.cases):
+        for scale in args.scale or case.scales:
+            result = measure(case, scale, args.repeat)
+            results.append(result)
+            print(
+                f"{result.key():<16}{result.parse:>12.4f}"
+                f"{result.solve:>12.4f}{result.peak // 1024:>14}"
+            )
+            if not args.update:
+                for regression in regressions(result, baseline, args.tolerance):
+                    print(f"    REGRESSION {regression}")
+                    failed = True
+
+    if args.update:
+        save_baseline(results, args.baseline)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
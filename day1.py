@@ -2,15 +2,146 @@
 day 1 of Advent of Code 2018
 by Stefan Kruger
 """
+from array import array
 from collections import Counter
+from itertools import accumulate, chain, islice
 
+from parsing import mmap_lines, to_int
+
+# Bytes of input parsed at a time by read_chunks()
+CHUNK_SIZE = 1 << 20
+
+
+def read_data(filename="data/input1.data", stream=False):
+    """
+    Return the frequency changes as a list, or with stream=True as an
+    iterator that reads them lazily from a memory map.
+    """
+    if stream:
+        return mmap_lines(filename, to_int)
 
-def read_data(filename="data/input1.data"):
     with open(filename) as f:
         return [int(item) for item in f.read().splitlines()]
 
 
+def read_chunks(filename="data/input1.data", chunk_size=CHUNK_SIZE):
+    """
+    Yield the frequency changes as array('q') chunks, parsing about
+    chunk_size bytes at a time so that memory use is bounded by the chunk
+    size rather than the input size.
+    """
+    with open(filename, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+
+            # Only parse complete lines; carry the rest over.
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            (block, tail) = (block[:cut], block[cut:])
+            if block:
+                yield array("q", map(int, block.split()))
+
+        if tail.strip():
+            yield array("q", map(int, tail.split()))
+
+
+def prefix_sums(chunks):
+    """
+    Given the changes in chunks, return the frequencies visited on the
+    first pass, starting at 0, as an array('q'), along with the drift (the
+    total change over a pass).
+    """
+    visited = array("q", [0])
+    for chunk in chunks:
+        running = accumulate(chain([visited[-1]], chunk))
+        next(running)  # already in visited
+        visited.extend(running)
+
+    drift = visited.pop()
+
+    return (visited, drift)
+
+
 def part2(data):
+    """
+    Find the first frequency reached twice, when the list of changes is
+    applied over and over again.
+
+    Let s be the frequencies visited on the first pass (starting at 0) and
+    drift the total change per pass, so pass k visits s[i] + k * drift. If
+    there is no repeat on the first pass, s[j] on pass k can only hit a
+    first-pass frequency s[i] where s[i] - s[j] == k * drift: same residue
+    modulo drift, and on the side the frequencies are drifting towards.
+    For each s[j] the nearest such s[i] in its residue class gives the
+    earliest repeat, at step k * len(data) + j.
+
+    Cost is O(n log n) whatever the number of passes. Returns None if no
+    frequency is ever repeated. part2_reference() is the brute-force loop.
+    """
+    if not data:
+        raise ValueError("no frequency changes")
+
+    return first_repeat(*prefix_sums([data]))
+
+
+def first_repeat(visited, drift):
+    """
+    The body of part2(), given the frequencies visited on the first pass
+    and the drift, as returned by prefix_sums().
+
+    Both searches sort an array('q') of indexes into visited by a single
+    integer key and compare neighbours, rather than building a set or a
+    tuple per frequency. The sort itself still briefly holds a list of
+    O(n) Python ints.
+    """
+    size = len(visited)
+
+    # Indexes by frequency, and in visiting order for equal frequencies, so
+    # the first repeat is the earliest second member of a run.
+    order = array("q", sorted(range(size), key=visited.__getitem__))
+    first = None
+    for (i, j) in zip(order, islice(order, 1, None)):
+        if visited[i] == visited[j] and (first is None or j < first):
+            first = j
+    if first is not None:
+        return visited[first]
+
+    if drift == 0:
+        return 0  # back at the start on the second pass
+
+    # Work with an increasing drift; flip the sign back on the way out.
+    sign = 1 if drift > 0 else -1
+    drift *= sign
+    low = min(visited) if sign > 0 else -max(visited)
+    span = (max(visited) - min(visited)) + 1
+
+    def key(index):
+        """
+        Order by residue modulo drift, then by frequency.
+        """
+        freq = visited[index] * sign
+        return (freq % drift) * span + freq - low
+
+    order = array("q", sorted(range(size), key=key))
+    best = None
+    for (i, j) in zip(order, islice(order, 1, None)):
+        (freq, target) = (visited[i] * sign, visited[j] * sign)
+        if (target - freq) % drift:
+            continue  # the last of one residue class, the first of the next
+        step = (target - freq) // drift * size + i
+        if best is None or step < best[0]:
+            best = (step, target)
+
+    return None if best is None else best[1] * sign
+
+
+def part2_reference(data):
+    """
+    Brute force: keep applying the changes until a frequency repeats.
+    """
     freqs = Counter()
     current = 0
 
@@ -23,7 +154,18 @@ def part2(data):
             current += f
 
 
+def solve_part1(filename="data/input1.data"):
+    return sum(sum(chunk) for chunk in read_chunks(filename))
+
+
+def solve_part2(filename="data/input1.data"):
+    (visited, drift) = prefix_sums(read_chunks(filename))
+    if not visited:
+        raise ValueError("no frequency changes")
+
+    return first_repeat(visited, drift)
+
+
 if __name__ == "__main__":
-    data = read_data()
-    print(sum(data))
-    print(part2(data))
+    print(solve_part1())
+    print(solve_part2())
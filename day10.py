@@ -2,15 +2,14 @@
 day 10 of Advent of Code 2018
 by Stefan Kruger
 """
-import re
+from parsing import read_ints, rows
 
 
 def read_data(filename="data/input10.data"):
-    with open(filename) as f:
-        return [
-            [int(n) for n in re.findall(r"-?\d+", l)]
-            for l in f.read().splitlines()
-        ]
+    """
+    position=< 20247,  40241> velocity=<-2, -4>
+    """
+    return rows(*read_ints(filename, 4))
 
 
 def pos(line, i):
@@ -39,10 +38,10 @@ def find_min_bbox(lines):
     return best
 
 
-if __name__ == "__main__":
-    lines = read_data()
-    (second, _, xmin, xmax, ymin, ymax) = find_min_bbox(lines)
-
+def render(lines, second, xmin, xmax, ymin, ymax):
+    """
+    Return the message at the given second as a multi-line string.
+    """
     # We know the bounding box, so we can allocate a "display" of the
     # right size.
     display = [[" "] * (xmax - xmin + 1) for y in range(ymin, ymax + 1)]
@@ -54,8 +53,19 @@ if __name__ == "__main__":
         # shift by (xmin, ymin)
         display[coord[1] - ymin][coord[0] - xmin] = "#"
 
-    print(f"Part1:")
-    for row in display:
-        print("".join(row))
+    return "\n".join("".join(row) for row in display)
 
-    print(f"Part2: Best iteration: {second}")
+
+def solve_part1(filename="data/input10.data"):
+    lines = read_data(filename)
+    (second, _, xmin, xmax, ymin, ymax) = find_min_bbox(lines)
+    return render(lines, second, xmin, xmax, ymin, ymax)
+
+
+def solve_part2(filename="data/input10.data"):
+    return find_min_bbox(read_data(filename))[0]
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
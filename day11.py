@@ -54,24 +54,33 @@ def proc(task):
     return task[0].find_max(task[1])
 
 
-if __name__ == "__main__":
-    puzzle_input = 7803
+def read_data(filename="data/input11.data"):
+    with open(filename) as f:
+        return int(f.read().strip())
 
-    grid = Grid(puzzle_input)
-    best = grid.find_max(3)
 
-    print(f"Part1: {best}")
+def solve_part1(filename="data/input11.data"):
+    (_, x, y, _) = Grid(read_data(filename)).find_max(3)
+    return f"{x},{y}"
 
-    # for size in range(1, 301):
-    #     candidate = grid.find_max(size)
-    #     if candidate[0] > best[0]:
-    #         best = candidate
 
-    # print(f"Part2: {best}")
+def solve_part2(filename="data/input11.data"):
+    """
+    Try every filter size, spread over a process pool.
+    """
+    grid = Grid(read_data(filename))
+    best = grid.find_max(3)
 
     tasks = [(grid, i) for i in range(1, 301)]
     with concurrent.futures.ProcessPoolExecutor() as executor:
         for candidate in executor.map(proc, tasks):
             if candidate[0] > best[0]:
                 best = candidate
-                print(best)
+
+    (_, x, y, size) = best
+    return f"{x},{y},{size}"
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
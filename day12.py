@@ -45,50 +45,64 @@ class Pots:
         self.state = next_gen
 
 
-if __name__ == "__main__":
-    (initial_state, rules) = parse_data(read_data())
+def solve_part1(filename="data/input12.data"):
+    (initial_state, rules) = parse_data(read_data(filename))
 
     pots = Pots(initial_state)
     for gen in range(20):
         pots.generate(rules)
 
-    plants = sum(pots.state)
+    return sum(pots.state)
+
+
+def solve_part2(filename="data/input12.data", generations=50000000000):
+    """
+    Part 2: 50000000000 generations...
+
+    Too much to brute-force. Working hypothesis: check for emergent stable
+    pattern. The two simplest potential options are:
+
+    1. Constant -- checksum converges to fixed value
+    2. Constant change -- checksum change converges to fixed value
 
-    print(f"Part1: {plants}")
+    Pretty easy to confirm that that the second case is what we have, e.g.
 
-    # Part 2: 50000000000 generations...
-    #
-    # Too much to brute-force. Working hypothesis: check for emergent stable
-    # pattern. The two simplest potential options are:
-    #
-    # 1. Constant -- checksum converges to fixed value
-    # 2. Constant change -- checksum change converges to fixed value
-    #
-    # Pretty easy to confirm that that the second case is what we have:
+        Gen: 92 checksum diff: 157
+        Gen: 93 checksum diff: -61
+        Gen: 94 checksum diff: 101
+        Gen: 95 checksum diff: -5
+        Gen: 96 checksum diff: 48
+        Gen: 97 checksum diff: 48
+        Gen: 98 checksum diff: 51
+        Gen: 99 checksum diff: 51
+        Gen: 100 checksum diff: 51
+        Gen: 101 checksum diff: 51
+        Gen: 102 checksum diff: 51  etc etc etc
+
+    So once the checksum change has stayed the same for a while, every
+    subsequent generation adds that much to the value.
+    """
+    (initial_state, rules) = parse_data(read_data(filename))
 
     pots = Pots(initial_state)
     val = sum(pots.state)
-    for gen in range(100):
+    diff = None
+    stable = 0
+    gen = 0
+    while stable < 10 and gen < generations:
         pots.generate(rules)
+        gen += 1
         checksum = sum(pots.state)
-        print(f"Gen: {gen} checksum: {checksum} checksum diff: {checksum - val}")
+        if checksum - val == diff:
+            stable += 1
+        else:
+            diff = checksum - val
+            stable = 0
         val = checksum
 
-    # # gives:
-    # Gen: 92 checksum diff: 157
-    # Gen: 93 checksum diff: -61
-    # Gen: 94 checksum diff: 101
-    # Gen: 95 checksum diff: -5
-    # Gen: 96 checksum diff: 48
-    # Gen: 97 checksum diff: 48
-    # Gen: 98 checksum diff: 51
-    # Gen: 99 checksum diff: 51
-    # Gen: 100 checksum diff: 51
-    # Gen: 101 checksum diff: 51
-    # Gen: 102 checksum diff: 51  etc etc etc
-    #
-    # So we can conclude that after the 97th generation, every subsequent
-    # generation adds 51 to the value.
-
-    # Gen: 97 checksum: 6193 checksum diff: 48
-    print(f"Part2: {6193+(50000000000-98)*51}")
+    return val + (generations - gen) * diff
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
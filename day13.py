@@ -228,27 +228,45 @@ class Map:
                 movefn(cart)
 
 
-if __name__ == "__main__":
-    lines = read_data()
+def first_collision(lines):
+    """
+    Return the position of the first collision, and the number of ticks it
+    took to get there.
+    """
     tracks = Map.from_lines(lines)
 
     tick = 0
-    coll_pos = None
     while True:
         try:
             tracks.tick(tracks.move)
         except Collision as coll:
-            coll_pos = coll.args[0]
-            break
+            return (coll.args[0], tick)
         tick += 1
 
-    print(f"Part1: collision at {coll_pos} after {tick} ticks")
 
-    # Part2: run and remove wrecks after each collision until only one cart
-    # left
+def last_survivor(lines):
+    """
+    Part2: run and remove wrecks after each collision until only one cart
+    left
+    """
     tracks = Map.from_lines(lines)
 
     while len(tracks.carts) > 1:
         tracks.tick(tracks.p2move)
 
-    print(f"Part2: survivor at {list(tracks.carts.keys())[0]}")
+    return list(tracks.carts.keys())[0]
+
+
+def solve_part1(filename="data/input13.data"):
+    (x, y) = first_collision(read_data(filename))[0]["pos"]
+    return f"{x},{y}"
+
+
+def solve_part2(filename="data/input13.data"):
+    (x, y) = last_survivor(read_data(filename))
+    return f"{x},{y}"
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
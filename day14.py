@@ -32,21 +32,34 @@ class ChocolateLab:
         return (self.recipes[-pl-1:-1] == self.ipattern, 1)
 
 
-if __name__ == "__main__":
-    pattern = "765071"
+def read_data(filename="data/input14.data"):
+    with open(filename) as f:
+        return f.read().strip()
+
+
+def solve_part1(filename="data/input14.data"):
+    pattern = read_data(filename)
     l = ChocolateLab(pattern)
     while len(l.recipes) < int(pattern) + 10:
         l.advance()
 
-    p1data = l.recipes[int(pattern):int(pattern) + 11]
+    p1data = l.recipes[int(pattern):int(pattern) + 10]
+
+    return ''.join([str(d) for d in p1data])
 
-    print(f"Part1: {''.join([str(d) for d in p1data])}")
 
-    # Part 2 -- takes 35s to run
+def solve_part2(filename="data/input14.data"):
+    """
+    Part 2 -- takes 35s to run
+    """
+    pattern = read_data(filename)
     l = ChocolateLab(pattern)
     while True:
         (match, offset) = l.advance()
         if match:
-            pos = len(l.recipes) - len(pattern) - offset
-            print(f"Part2: {pos}")
-            break
+            return len(l.recipes) - len(pattern) - offset
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
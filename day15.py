@@ -284,9 +284,8 @@ class Cave:
 
         return game_over, killed, team
 
-if __name__ == "__main__":
-    lines = read_data()
-    cave = Cave.from_data(lines)
+def solve_part1(filename="data/input15.data"):
+    cave = Cave.from_data(read_data(filename))
     turns = 1
     game_over = False
     while not game_over:
@@ -297,16 +296,19 @@ if __name__ == "__main__":
 
     hp = cave.hitpoints_remaining()
 
-    print(f"Part1: {(turns-1)*hp}")
+    return (turns-1)*hp
 
-    # Part2: Vary the Elves attacking strength until no Elves are lost. This is pretty fast as is
-    # but could be faster with a binary search.
 
+def solve_part2(filename="data/input15.data"):
+    """
+    Part2: Vary the Elves attacking strength until no Elves are lost. This is
+    pretty fast as is but could be faster with a binary search.
+    """
+    lines = read_data(filename)
     for ap in range(4, 200):
         cave = Cave.from_data(lines)
         for elf in cave.elves.values():
             elf.attack = ap
-        elf_count_before = len(cave.elves)
         turns = 1
         game_over = False
         while not game_over:
@@ -316,8 +318,12 @@ if __name__ == "__main__":
             turns += 1
         if game_over:
             hp = cave.hitpoints_remaining()
-            print(f"Part2: {(turns-1)*hp} Elves win with attackpoints at {ap} after {turns-1}")
-            break            
+            return (turns-1)*hp
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
 
     
 
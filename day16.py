@@ -5,7 +5,8 @@ by Stefan Kruger
 
 from copy import copy
 from collections import defaultdict
-import re
+
+from parsing import ints
 
 class Instr:
 
@@ -143,29 +144,24 @@ def analyse_sample(before, instruction, after):
 
 def read_data(filename="data/input16-1.data"):
     with open(filename) as f:
-        return f.read().splitlines()
+        return f.read()
 
-def parse_data(lines):
+def parse_data(data):
     """
     Before, Instruction, After
     """
-    result = []
-    for l in range(0, len(lines), 4):
-        op = []
-        for data in [lines[l], lines[l+1], lines[l+2]]:
-            op.append([int(n) for n in re.findall(r"-?\d+", data)])
-        result.append(op)
-
-    return result
+    (values, stride) = ints(data, 12)
+    return [
+        [list(values[i:i+4]), list(values[i+4:i+8]), list(values[i+8:i+12])]
+        for i in range(0, len(values), stride)
+    ]
 
-def parse_data_part2(lines):
+def parse_data_part2(data):
     """
     opcode A B C
     """
-    return [
-        [int(n) for n in re.findall(r"-?\d+", line)]
-        for line in lines
-    ]
+    (values, stride) = ints(data, 4)
+    return [list(values[i:i+stride]) for i in range(0, len(values), stride)]
             
 def find_opcodes(samples):
     by_opcode = defaultdict(set)
@@ -195,27 +191,30 @@ def find_opcodes(samples):
     }
 
 
-if __name__ == "__main__":
-    lines = read_data()
-    samples = parse_data(lines)
+def solve_part1(filename="data/input16-1.data"):
+    samples = parse_data(read_data(filename))
 
     count = 0
     for before, instruction, after in samples:
         if len(analyse_sample(before, instruction, after)) >= 3:
             count += 1
-    
-    print(f"Part1: {count}")
 
-    opcodes = find_opcodes(samples)
- 
-    lines = read_data(filename="data/input16-2.data")
-    instructions = parse_data_part2(lines)
+    return count
+
+def solve_part2(filename="data/input16-1.data", program="data/input16-2.data"):
+    opcodes = find_opcodes(parse_data(read_data(filename)))
+
+    instructions = parse_data_part2(read_data(filename=program))
 
     register = [0, 0, 0, 0]
     for instr in instructions:
         op = opcodes[instr[0]]
         register = op(register, instr)
 
-    print(f"Part2: {register[0]}")
+    return register[0]
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
 
 
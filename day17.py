@@ -4,9 +4,13 @@ by Stefan Kruger
 """
 import re
 
+from parsing import ints
+
+AXIS = re.compile(r"^\s*([xy])=", re.MULTILINE)
+
 def read_data(filename="data/input17.data"):
     with open(filename) as f:
-        return f.read().splitlines()
+        return f.read()
 
 class UniqueStack:
     def __init__(self):
@@ -33,20 +37,26 @@ class Cave:
         self.wet_sand = set()
 
     @classmethod
-    def from_data(cls, lines):
+    def from_data(cls, data):
         """
         Lines hold a fixed coordinate, x or y, and a range for the other, e.g:
 
         x=413, y=1421..1439
         y=1610, x=208..228
+
+        data is the raw text, or a list of lines.
         """
+        if isinstance(data, (list, tuple)):
+            data = "\n".join(data)
+
+        (coords, stride) = ints(data, 3)
         clay = set()
-        for line in lines:
-            coords = [int(n) for n in re.findall(r"-?\d+", line)]
-            if line.startswith("x"):
-                clay.update({(coords[0], y) for y in range(coords[1], coords[2] + 1)})
+        for index, axis in enumerate(AXIS.findall(data)):
+            (fixed, low, high) = coords[index * stride:(index + 1) * stride]
+            if axis == "x":
+                clay.update({(fixed, y) for y in range(low, high + 1)})
             else:
-                clay.update({(x, coords[0]) for x in range(coords[1], coords[2] + 1)})
+                clay.update({(x, fixed) for x in range(low, high + 1)})
 
         xdim = (min(clay, key=lambda c: c[0])[0]-1,  max(clay, key=lambda c: c[0])[0] + 1)
         ydim = (min(clay, key=lambda c: c[1])[1],  max(clay, key=lambda c: c[1])[1] + 1)
@@ -166,19 +176,29 @@ class Cave:
                     pass
             
 
-if __name__ == "__main__":
-    lines = read_data()
-    c = Cave.from_data(lines)
+def flood(data):
+    c = Cave.from_data(data)
 
     i = 0
     while i < 819:
         c.fill((500, 1))
         i += 1
 
+    return c
+
+def solve_part1(filename="data/input17.data"):
+    c = flood(read_data(filename))
+
     s = 0
     for pos in c.wet_sand.union(c.settled):
         if pos[1] in range(c.ydim[0], c.ydim[1]+1):
             s += 1
 
-    print(f"Part1: {s}")
-    print(f"Part2: {len(c.settled)}")
\ No newline at end of file
+    return s
+
+def solve_part2(filename="data/input17.data"):
+    return len(flood(read_data(filename)).settled)
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
\ No newline at end of file
@@ -77,33 +77,35 @@ class Forest:
         self.counter = c
  
 
-if __name__ == "__main__":
-    lines = read_data()
-
-    forest = Forest.from_data(lines)
+def solve_part1(filename="data/input18.data"):
+    forest = Forest.from_data(read_data(filename))
 
     for i in range(1, 11):
         forest.generate()
 
-    print(f"Part1: {forest.counter[TREE] * forest.counter[LUMBER]}")
-
-    # Part 2, what's the value after a beeeeellioooon iterations?
-    # 
-    # Too large to actually run, but all "game of life"-style cellular
-    # automata fall into certain patterns, especially as this one is
-    # constrained to a 50x50 grid.
-    # 
-    # We can assume that it will either converge to a stable state, or 
-    # become periodic.
-    #
-    # By just letting this run and looking at the visualisation, it's 
-    # clear that it very quickly becomes periodic (period 28). The value 
-    # at 1_000_000_000 generations should be the same as the value at 1_000.
-
-    forest = Forest.from_data(lines)
+    return forest.counter[TREE] * forest.counter[LUMBER]
+
+def solve_part2(filename="data/input18.data"):
+    """
+    Part 2, what's the value after a beeeeellioooon iterations?
+
+    Too large to actually run, but all "game of life"-style cellular
+    automata fall into certain patterns, especially as this one is
+    constrained to a 50x50 grid.
+
+    We can assume that it will either converge to a stable state, or
+    become periodic.
+
+    By just letting this run and looking at the visualisation, it's
+    clear that it very quickly becomes periodic (period 28). The value
+    at 1_000_000_000 generations should be the same as the value at 1_000.
+    """
+    forest = Forest.from_data(read_data(filename))
     for i in range(1, 1_001):
         forest.generate()
 
-    print(f"Part2: {forest.counter[TREE] * forest.counter[LUMBER]}")
-
+    return forest.counter[TREE] * forest.counter[LUMBER]
 
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
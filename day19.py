@@ -65,14 +65,9 @@ def parse_data(lines):
     return ip, code
 
 
-if __name__ == "__main__":
-    lines = read_data()
- 
-    ip_reg, instructions = parse_data(lines)
-
+def run(ip_reg, instructions, register):
     ip = 0
-    register = [0, 0, 0, 0, 0, 0]
-    opcodes = Instr.symtable() 
+    opcodes = Instr.symtable()
 
     while ip < len(instructions):
 
@@ -85,39 +80,46 @@ if __name__ == "__main__":
 
         # Execute instruction
         op(register, instr)
-        
+
         # Copy IP from bound register
         ip = register[ip_reg]
 
         # Next instruction
-        ip += 1        
-
-    print(f"Part1: {register[0]}")
-
-    # Part2: note that the solution as presented here is only valid
-    # for the specific input as given in data/input19.data. It was
-    # arrived at by disassembling the code 'by hand'.
-    #
-    # Starting with register = [1, 0, 0, 0, 0, 0] is a very
-    # different proposition. There are two nested loops, the key one
-    # the section at ip=3-11. In all it basically looks like this:
-    #
-    # reg = [0, 1, 10551432, 1, 1, 3] -- state when we enter loop
-    # 
-    # while reg[3] <= reg[2]:
-    #     reg[1] = 1
-    #     while reg[1] <= reg[2]:
-    #         if reg[3] * reg[1] == reg[2]:
-    #             reg[0] += reg[3]
-    #         reg[1] += 1
-    #     reg[3] += 1
-    # 
-    # so that's two nested loops to 10_551_432 -- too much to run.
-    #
-    # However, we can optimise away the inner loop completely, as shown
-    # below, as it only modifies register[0] whenever register[3]
-    # divides register[2]:
+        ip += 1
+
+    return register
+
+def solve_part1(filename="data/input19.data"):
+    ip_reg, instructions = parse_data(read_data(filename))
+    register = run(ip_reg, instructions, [0, 0, 0, 0, 0, 0])
+    return register[0]
+
+def solve_part2(filename="data/input19.data"):
+    """
+    Part2: note that the solution as presented here is only valid
+    for the specific input as given in data/input19.data. It was
+    arrived at by disassembling the code 'by hand'.
 
+    Starting with register = [1, 0, 0, 0, 0, 0] is a very
+    different proposition. There are two nested loops, the key one
+    the section at ip=3-11. In all it basically looks like this:
+
+    reg = [0, 1, 10551432, 1, 1, 3] -- state when we enter loop
+
+    while reg[3] <= reg[2]:
+        reg[1] = 1
+        while reg[1] <= reg[2]:
+            if reg[3] * reg[1] == reg[2]:
+                reg[0] += reg[3]
+            reg[1] += 1
+        reg[3] += 1
+
+    so that's two nested loops to 10_551_432 -- too much to run.
+
+    However, we can optimise away the inner loop completely, as shown
+    below, as it only modifies register[0] whenever register[3]
+    divides register[2]:
+    """
     register = [0, 1, 10551432, 1, 1, 3]
 
     while register[3] <= register[2]:
@@ -125,4 +127,8 @@ if __name__ == "__main__":
             register[0] += register[3]
         register[3] += 1
 
-    print(f"Part2: {register[0]}")
+    return register[0]
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -2,19 +2,55 @@
 day 1 of Advent of Code 2018
 by Stefan Kruger
 """
-from collections import Counter
+from collections import Counter, defaultdict
+from string import ascii_lowercase
+import mmap
+import os
 
+from parsing import mmap_lines
+
+# Rows of fixed-width IDs handled at a time by checksum()
+CHUNK_ROWS = 1 << 16
+
+
+def indicator(value):
+    """
+    A bytes.translate() table mapping value to 1 and all other bytes to 0.
+    """
+    return bytes(int(i == value) for i in range(256))
+
+
+LETTER_TABLES = [indicator(c) for c in range(ord("a"), ord("z") + 1)]
+# The letters a-z, both as characters and as bytes of streamed lines
+LETTERS = frozenset(ascii_lowercase) | frozenset(ascii_lowercase.encode())
+IS_TWO = indicator(2)
+IS_THREE = indicator(3)
+
+
+def read_data(filename="data/input2.data", stream=False):
+    """
+    Return the box IDs as a list, or with stream=True as an iterator of
+    memoryview slices read lazily from a memory map.
+    """
+    if stream:
+        return mmap_lines(filename)
 
-def read_data(filename="data/input2.data"):
     with open(filename) as f:
         return f.read().splitlines()
 
 
 def check(item):
+    """
+    Return (twos, threes), flagging whether some letter occurs exactly
+    twice, and exactly three times, in an ID. As in block_checksum(), only
+    the letters a-z are counted.
+    """
     freq = Counter(list(item))
     twos = 0
     threes = 0
-    for frequency in freq.values():
+    for (letter, frequency) in freq.items():
+        if letter not in LETTERS:
+            continue
         if frequency == 2:
             twos = 1
         if frequency == 3:
@@ -34,6 +70,93 @@ def part1(data):
     return two_count * three_count
 
 
+def block_checksum(block, width):
+    """
+    Count the IDs with a letter occurring exactly twice, and exactly three
+    times, in a block of newline-terminated IDs all width bytes long
+    (including the newline). Returns (twos, threes).
+
+    This works on whole columns rather than on individual IDs. Translating
+    a column with a letter's table gives a 1 byte for each row holding that
+    letter there; adding up the columns as big integers gives the letter's
+    count for every row at once, one byte per row (no carries, as an ID is
+    shorter than 256). Translating those counts again flags the rows with a
+    count of 2 or 3, and OR-ing the flags over all letters gives the rows
+    to count. Only the letters a-z are counted.
+    """
+    rows = len(block) // width
+    columns = [block[j::width] for j in range(width - 1)]
+
+    twos = 0
+    threes = 0
+    for table in LETTER_TABLES:
+        total = 0
+        for column in columns:
+            total += int.from_bytes(column.translate(table), "little")
+        counts = total.to_bytes(rows, "little")
+        twos |= int.from_bytes(counts.translate(IS_TWO), "little")
+        threes |= int.from_bytes(counts.translate(IS_THREE), "little")
+
+    return (bin(twos).count("1"), bin(threes).count("1"))
+
+
+def fixed_width(mm, width):
+    """
+    Return True if every line in mm is width bytes long, including the
+    newline, except perhaps an unterminated last line.
+    """
+    body = len(mm) - len(mm) % width
+    step = width * CHUNK_ROWS
+    for start in range(0, body, step):
+        block = mm[start:min(start + step, body)]
+        rows = len(block) // width
+        if block[width-1::width].count(b"\n") != rows:
+            return False
+        if block.count(b"\n") != rows:
+            return False
+
+    tail = mm[body:]
+    return not tail or (len(tail) == width - 1 and b"\n" not in tail)
+
+
+def checksum(filename="data/input2.data"):
+    """
+    Part 1 as a single pass over a memory map of the file, using
+    block_checksum() on CHUNK_ROWS IDs at a time. Falls back to part1() on
+    streamed lines if the IDs aren't all the same length.
+
+    As with block_checksum(), only the letters a-z are counted, including
+    on an unterminated last line.
+    """
+    with open(filename, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            width = mm.find(b"\n") + 1
+            if not 1 < width <= 256 or not fixed_width(mm, width):
+                return part1(mmap_lines(filename))
+
+            two_count = 0
+            three_count = 0
+            body = size - size % width
+            step = width * CHUNK_ROWS
+            for start in range(0, body, step):
+                (twos, threes) = block_checksum(
+                    mm[start:min(start + step, body)], width
+                )
+                two_count += twos
+                three_count += threes
+
+            if body < size:  # no newline at the end
+                (twos, threes) = block_checksum(mm[body:] + b"\n", width)
+                two_count += twos
+                three_count += threes
+
+    return two_count * three_count
+
+
 def difflen_one(item1, item2):
     diff = 0
     l1 = list(item1)
@@ -48,7 +171,81 @@ def difflen_one(item1, item2):
     return diff == 1
 
 
+def near_duplicates(data, positions=None):
+    """
+    Yield every pair of IDs that differ in exactly one position.
+
+    Rather than compare all pairs, hash each ID with one position cut out:
+    two IDs of the same length collide on that key exactly when they differ
+    at that position only. That's O(n * L) expected time for n IDs of
+    length L, holding one position's table at a time. positions limits the
+    positions checked (default: all). Repeated IDs are only considered once.
+    """
+    # Drop repeats up front, keeping the first-seen order, so no bucket
+    # needs searching for them.
+    data = list(dict.fromkeys(data))
+
+    if positions is None:
+        positions = range(max((len(box_id) for box_id in data), default=0))
+
+    for pos in positions:
+        table = defaultdict(list)
+        for box_id in data:
+            if pos >= len(box_id):
+                continue
+            bucket = table[box_id[:pos] + box_id[pos+1:]]
+            for other in bucket:
+                yield (other, box_id)
+            bucket.append(box_id)
+
+
+def shard(task):
+    (data, positions) = task
+    return list(near_duplicates(data, positions))
+
+
+def matching_pairs(data, jobs=1):
+    """
+    Return all pairs of IDs that differ in exactly one position. With
+    jobs > 1, the positions are split between that many processes.
+    """
+    if jobs <= 1:
+        return list(near_duplicates(data))
+
+    # Imported here rather than at the top: neither solver fans out, so
+    # only callers asking for jobs > 1 should pay to load the pool.
+    import concurrent.futures
+
+    length = max((len(box_id) for box_id in data), default=0)
+    tasks = [(data, range(start, length, jobs)) for start in range(jobs)]
+
+    pairs = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        for found in executor.map(shard, tasks):
+            pairs.extend(found)
+
+    return pairs
+
+
+def common_letters(item1, item2):
+    return "".join(c1 for (c1, c2) in zip(item1, item2) if c1 == c2)
+
+
 def part2(data):
+    """
+    Return the letters common to the first pair of IDs found that differ in
+    exactly one position, or "" if there are none.
+    """
+    for (item1, item2) in near_duplicates(data):
+        return common_letters(item1, item2)
+
+    return ""
+
+
+def part2_reference(data):
+    """
+    The original pairwise comparison, O(n^2 * L).
+    """
     result = set()
     for item1 in data:
         for item2 in data:
@@ -68,7 +265,14 @@ def part2(data):
     return mystr
 
 
+def solve_part1(filename="data/input2.data"):
+    return checksum(filename)
+
+
+def solve_part2(filename="data/input2.data"):
+    return part2(read_data(filename))
+
+
 if __name__ == "__main__":
-    data = read_data()
-    print(part1(data))
-    print(part2(data))
+    print(solve_part1())
+    print(solve_part2())
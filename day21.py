@@ -124,17 +124,14 @@ def parse_data(lines):
     return ip, code
 
 
-if __name__ == "__main__":
-    lines = read_data()
-
-    ip_reg, instructions = parse_data(lines)
-
+def exit_checks(ip_reg, instructions):
+    """
+    Run the program, yielding the value in register[2] each time the exit
+    condition on line 28 is reached.
+    """
     ip = 0
     register = [0, 0, 0, 0, 0, 0]
-    opcodes = Instr.symtable() 
-
-    solutions = set()
-    candidate = None
+    opcodes = Instr.symtable()
 
     while ip < len(instructions):
         # Fetch
@@ -148,50 +145,38 @@ if __name__ == "__main__":
         op(register, instr)
 
         if ip == 28:
-            break
-        
+            yield register[2]
+
         # Copy IP from bound register
         ip = register[ip_reg]
 
         # Next instruction
         ip += 1
 
-    print(f"Part1: {register[2]}")
+def solve_part1(filename="data/input21.data"):
+    ip_reg, instructions = parse_data(read_data(filename))
+    return next(exit_checks(ip_reg, instructions))
 
-    
-    # For part 2 we keep track of all solutions until
-    # they start to repeat. The last value of the cycle
-    # is the one we want
+def solve_part2(filename="data/input21.data"):
+    """
+    For part 2 we keep track of all solutions until
+    they start to repeat. The last value of the cycle
+    is the one we want
+    """
+    ip_reg, instructions = parse_data(read_data(filename))
 
     solutions = set()
     candidate = None
 
-    ip = 0
-    register = [0, 0, 0, 0, 0, 0]
-
-    while ip < len(instructions):
-        # Fetch
-        instr = instructions[ip]
-        op = opcodes[instr[0]]
-
-        # Copy IP into bound register
-        register[ip_reg] = ip
-
-        # Execute instruction
-        op(register, instr)
-
-        if ip == 28:
-            if register[2] in solutions:
-                break
-            candidate = register[2]
-            solutions.add(register[2])
-    
-        
-        # Copy IP from bound register
-        ip = register[ip_reg]
+    for value in exit_checks(ip_reg, instructions):
+        if value in solutions:
+            break
+        candidate = value
+        solutions.add(value)
 
-        # Next instruction
-        ip += 1
+    return candidate
 
-    print(f"Part2: {candidate}")
 
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -5,6 +5,17 @@ by Stefan Kruger
 from functools import lru_cache
 import heapq
 import math
+import re
+
+def read_data(filename="data/input22.data"):
+    """
+    depth: 10689
+    target: 11,722
+    """
+    with open(filename) as f:
+        (depth, x, y) = map(int, re.findall(r"\d+", f.read()))
+
+    return depth, (x, y)
 
 def erosion_level(t, depth):
     return (t + depth) % 20183
@@ -48,11 +59,7 @@ def neighbours(x, y, tool, target, depth):
                 cost = 8 if tool != new_tool else 1
                 yield xpos, ypos, new_tool, cost
 
-if __name__ == "__main__":
-
-    depth = 10689
-    target = (11, 722)
-
+def risk_level(target, depth):
     risk = 0
     for y in range(0, target[1]+1):
         for x in range(0, target[0]+1):
@@ -60,11 +67,13 @@ if __name__ == "__main__":
                 continue
             risk += region(x, y, target, depth)
 
-    print(f"Part1: {risk}")
-
-    # Part 2: a breadth-first search, with the tooling constraints.
-    # Relying on tool == region type == risk.
+    return risk
 
+def fastest_route(target, depth):
+    """
+    Part 2: a breadth-first search, with the tooling constraints.
+    Relying on tool == region type == risk.
+    """
     target_tool = (target[0], target[1], 1)
 
     # (time, xpos, ypos, tool)
@@ -74,8 +83,7 @@ if __name__ == "__main__":
         (t, x, y, tool) = heapq.heappop(frontier)
         current = (x, y, tool)
         if current == target_tool:
-            print(f"Part2: {t-1}")
-            break
+            return t-1
 
         if result.get(current, math.inf) < t:
             continue
@@ -88,3 +96,15 @@ if __name__ == "__main__":
             if t+cost < result.get((xpos, ypos, new_tool), math.inf):
                 result[(xpos, ypos, new_tool)] = t+cost
                 heapq.heappush(frontier, (t+cost, xpos, ypos, new_tool))
+
+def solve_part1(filename="data/input22.data"):
+    depth, target = read_data(filename)
+    return risk_level(target, depth)
+
+def solve_part2(filename="data/input22.data"):
+    depth, target = read_data(filename)
+    return fastest_route(target, depth)
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -4,12 +4,13 @@ day 23 of Advent of Code 2018
 by Stefan Kruger
 """
 
-import re
 import math
 from dataclasses import dataclass
 from typing import Tuple
 from queue import PriorityQueue
 
+from parsing import ints, rows
+
 @dataclass
 class Bot:
     pos: Tuple[int, int, int]
@@ -17,18 +18,18 @@ class Bot:
 
     @classmethod
     def from_string(cls, s):
-        data = list(map(int, re.findall(r"-?\d+", s)))
+        (data, _) = ints(s, 4)
         return cls(tuple(data[:3]), data[3])
 
 def read_data(filename="data/input23.data"):
     with open(filename) as f:
-        return f.read().splitlines()
+        return f.read()
 
-def parse_data(lines):
+def parse_data(text):
     strongest = None
     data = []
-    for line in lines:
-        b = Bot.from_string(line)
+    for (x, y, z, radius) in rows(*ints(text, 4)):
+        b = Bot((x, y, z), radius)
         if strongest is None or b.radius > strongest.radius:
             strongest = b
         data.append(b)
@@ -42,30 +43,29 @@ def manhattan_distance(a, b):
 
     return distance
 
-if __name__ == "__main__":
-    lines = read_data()
-    (strongest, data) = parse_data(lines)
-
+def in_range_of_strongest(strongest, data):
     reachable = 0
     for p in data:
-        d = manhattan_distance(strongest, p)
+        d = manhattan_distance(strongest.pos, p.pos)
         if d <= strongest.radius:
             reachable += 1
 
-    print(f"Part1: {reachable}")
-
-    # This isn't a general solution, but exploits the fact that the data
-    # consists of massively overlapping bots.
-    #
-    # The elegance is blinding, but credit does not belong to me.
-    #
-    #  https://www.reddit.com/r/adventofcode/comments/a8s17l/2018_day_23_solutions/ecdqzdg/
-    #
-    # Consider a 1-D projection of the bots, and find the min and max distance
-    # from the origin.
-    #
-    # Find the point that has the most overlaps.
-    #
+    return reachable
+
+def closest_best_point(data):
+    """
+    This isn't a general solution, but exploits the fact that the data
+    consists of massively overlapping bots.
+
+    The elegance is blinding, but credit does not belong to me.
+
+     https://www.reddit.com/r/adventofcode/comments/a8s17l/2018_day_23_solutions/ecdqzdg/
+
+    Consider a 1-D projection of the bots, and find the min and max distance
+    from the origin.
+
+    Find the point that has the most overlaps.
+    """
     q = PriorityQueue()
     for bot in data:
         d = abs(bot.pos[0]) + abs(bot.pos[1]) + abs(bot.pos[2])
@@ -82,4 +82,16 @@ if __name__ == "__main__":
             result = dist
             max_count = count
 
-    print(f"Part2: {result}")
+    return result
+
+def solve_part1(filename="data/input23.data"):
+    (strongest, data) = parse_data(read_data(filename))
+    return in_range_of_strongest(strongest, data)
+
+def solve_part2(filename="data/input23.data"):
+    (_, data) = parse_data(read_data(filename))
+    return closest_best_point(data)
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
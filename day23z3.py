@@ -10,21 +10,22 @@ https://github.com/Z3Prover/z3/wiki/Documentation
 This should be valid for all inputs.
 
 """
-import re
 from z3 import *
 
+from parsing import ints, rows
+
 def read_data(filename="data/input23.data"):
     with open(filename) as f:
         return f.read().splitlines()
 
 def parse_data(lines):
-    return [list(map(int, re.findall(r"-?\d+", s))) for s in lines]
+    return [list(row) for row in rows(*ints(lines, 4))]
 
 def zabs(x):
     return If(x >= 0, x, -x)
 
-if __name__ == "__main__":
-    bots = parse_data(read_data())
+def solve_part2(filename="data/input23.data"):
+    bots = parse_data(read_data(filename))
 
     (x, y, z) = (Int('x'), Int('y'), Int('z'))
     in_ranges = [Int('in_range_' + str(i)) for i in range(len(bots))]
@@ -44,4 +45,7 @@ if __name__ == "__main__":
 
     assert solver.lower(h2) == solver.upper(h2)
 
-    print(solver.lower(h2))
+    return solver.lower(h2)
+
+if __name__ == "__main__":
+    print(solve_part2())
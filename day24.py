@@ -85,6 +85,9 @@ class Cohort:
 
         return False
 
+    def units(self):
+        return sum(group.count for group in self.groups)
+
     def add_group(self, group):
         self.groups.append(group)
         group.gid = len(self.groups) - 1
@@ -233,38 +236,53 @@ def fight(immune, infection, max_initiative):
         attacker.attack(defender)
 
 
-if __name__ == "__main__":
-    immune, infection, max_initiative = parse_data(read_data())
-
-    i= 1
+def battle(immune, infection, max_initiative):
+    """
+    Fight until one side is wiped out. With some boosts neither side can
+    kill any more units, in which case we bail rather than fight forever.
+    """
     while immune.alive() and infection.alive():
+        units = immune.units() + infection.units()
         fight(immune, infection, max_initiative)
-        i += 1
+        if immune.units() + infection.units() == units:
+            break
 
-    print(f"------------ WINNER ------------")
-    immune.info()
-    infection.info()
+def solve_part1(filename="data/input24.data"):
+    immune, infection, max_initiative = parse_data(read_data(filename))
+    battle(immune, infection, max_initiative)
 
-    immune, infection, max_initiative = parse_data(read_data())
+    return immune.units() + infection.units()
+
+def solve_part2(filename="data/input24.data"):
+    """
+    Binary search over the "boost" to find the lowest boost required
+    to ensure an immune victory. The answer is the number of immune units
+    left after that fight.
+    """
+    global BOOST
+
+    immune, infection, max_initiative = parse_data(read_data(filename))
 
-    # Binary search over the "boost" to find the lowest boost required
-    # to ensure an immune victory. The answer is the last immune win shown.
-    # Fights take increasingly longer as the number of units decrease on
-    # both sides. An improvement would be to detect this and bail.
     boost_range = [1, 10_000]
-    while boost_range[1] - boost_range[0] > 1:
-        BOOST = sum(boost_range)//2
+    remaining = None
+    try:
+        while boost_range[0] <= boost_range[1]:
+            BOOST = sum(boost_range)//2
 
-        print(BOOST, boost_range)
-        imm = deepcopy(immune)
-        inf = deepcopy(infection)
+            imm = deepcopy(immune)
+            inf = deepcopy(infection)
+            battle(imm, inf, max_initiative)
 
-        while imm.alive() and inf.alive():
-            fight(imm, inf, max_initiative)
+            if imm.alive() and not inf.alive():  # Try smaller boost
+                remaining = imm.units()
+                boost_range[1] = BOOST - 1
+            else:
+                boost_range[0] = BOOST + 1
+    finally:
+        BOOST = 0
 
-        imm.info()
+    return remaining
 
-        if imm.alive():  # Try smaller boost
-            boost_range[1] = BOOST - 1
-        else:
-            boost_range[0] = BOOST + 1
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -2,18 +2,16 @@
 day 25 of Advent of Code 2018
 by Stefan Kruger
 """
-import re
 import networkx as nx
 
+from parsing import ints, rows
+
 def read_data(filename="data/input25.data"):
     with open(filename) as f:
-        return f.read().splitlines()
+        return f.read()
 
-def parse_data(lines):
-    return [
-        tuple(map(int, re.findall(r"-?\d+", line)))
-        for line in lines
-    ]
+def parse_data(data):
+    return rows(*ints(data, 4))
 
 def dist(a, b):
     return (
@@ -23,9 +21,7 @@ def dist(a, b):
         abs(a[3]-b[3])
     )
 
-if __name__ == "__main__":
-    data = parse_data(read_data())
-
+def constellations(data):
     G = nx.Graph()
 
     for i in data:
@@ -34,6 +30,10 @@ if __name__ == "__main__":
             if dist(i, j) <= 3:
                 G.add_edge(i, j)
 
-    clusters = list(nx.connected_components(G))
+    return list(nx.connected_components(G))
 
-    print(len(clusters))
+def solve_part1(filename="data/input25.data"):
+    return len(constellations(parse_data(read_data(filename))))
+
+if __name__ == "__main__":
+    print(solve_part1())
@@ -2,10 +2,16 @@
 day 3 of Advent of Code 2018
 by Stefan Kruger
 """
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
+from itertools import accumulate, chain
+from operator import add
 from typing import Tuple
 import re
 
+from parsing import decode, mmap_lines
+
 
 @dataclass
 class Claim:
@@ -57,17 +63,371 @@ class Fabric:
         return True
 
 
-def read_data(filename="data/input3.data"):
+class DenseFabric:
+    """
+    Dense alternative to Fabric, for fabrics where claims cover much of the
+    bounding box.
+
+    A reservation only records the four corner updates of a 2-D difference
+    array. On the first query after any reservations, the grid covering the
+    claims' bounding box is built in one prefix-sum pass. The first call to
+    is_undisputed() also builds a summed-area table of the points that
+    aren't claimed exactly once, after which each call is O(1). Rows are
+    array('i'), and the sums run in C via accumulate() and map().
+    """
+
+    def __init__(self):
+        self.rects = []
+        self.counts = None
+        self.table = None
+        self.origin = (0, 0)
+
+    def reserve(self, claim):
+        (x, y) = claim.origin
+        self.rects.append((x, y, x + claim.size[0], y + claim.size[1]))
+        self.counts = None
+        self.table = None
+
+    def _build(self):
+        if not self.rects:
+            self.counts = []
+            return
+
+        xmin = min(rect[0] for rect in self.rects)
+        ymin = min(rect[1] for rect in self.rects)
+        width = max(rect[2] for rect in self.rects) - xmin + 1
+        height = max(rect[3] for rect in self.rects) - ymin + 1
+        self.origin = (xmin, ymin)
+
+        diff = [array("i", [0]) * width for _ in range(height)]
+        for (x0, y0, x1, y1) in self.rects:
+            (x0, x1, y0, y1) = (x0 - xmin, x1 - xmin, y0 - ymin, y1 - ymin)
+            diff[y0][x0] += 1
+            diff[y0][x1] -= 1
+            diff[y1][x0] -= 1
+            diff[y1][x1] += 1
+
+        self.counts = []
+        previous = array("i", [0]) * width
+        for row in diff:
+            previous = array("i", map(add, previous, accumulate(row)))
+            self.counts.append(previous)
+
+    def _build_table(self):
+        if self.counts is None:
+            self._build()
+
+        width = len(self.counts[0]) if self.counts else 0
+        self.table = [array("i", [0]) * (width + 1)]
+        for counts in self.counts:
+            # Points not claimed exactly once; a claim is undisputed if it
+            # covers none of them.
+            contested = accumulate(chain([0], map((1).__ne__, counts)))
+            self.table.append(array("i", map(add, self.table[-1], contested)))
+
+    def disputed(self):
+        """
+        Return the number of points that are subject to more than one claim.
+        """
+        if self.counts is None:
+            self._build()
+
+        return sum(sum(map((1).__lt__, row)) for row in self.counts)
+
+    def is_undisputed(self, claim):
+        """
+        Return True if the claim is completely undisputed.
+        """
+        if claim.size[0] <= 0 or claim.size[1] <= 0:
+            return True
+
+        if self.table is None:
+            self._build_table()
+
+        x0 = claim.origin[0] - self.origin[0]
+        y0 = claim.origin[1] - self.origin[1]
+        (x1, y1) = (x0 + claim.size[0], y0 + claim.size[1])
+        if x0 < 0 or y0 < 0 or y1 >= len(self.table) or x1 >= len(self.table[0]):
+            return False
+
+        table = self.table
+        contested = table[y1][x1] - table[y0][x1] - table[y1][x0] + table[y0][x0]
+
+        return contested == 0
+
+
+class CoverageTree:
     """
-    Load the raw datafile
+    Segment tree over compressed coordinates ys, tracking how much of the
+    axis is covered by at least one, and by at least two, of the intervals
+    added so far. Interval [l, r) spans ys[l] to ys[r].
     """
+
+    def __init__(self, ys):
+        self.ys = ys
+        size = 4 * max(len(ys), 1)
+        self.cover = [0] * size
+        self.once = [0] * size
+        self.twice = [0] * size
+
+    def update(self, l, r, delta, node=1, lo=0, hi=None):
+        if hi is None:
+            hi = len(self.ys) - 1
+        if r <= lo or hi <= l:
+            return
+
+        if l <= lo and hi <= r:
+            self.cover[node] += delta
+        else:
+            mid = (lo + hi) // 2
+            self.update(l, r, delta, 2 * node, lo, mid)
+            self.update(l, r, delta, 2 * node + 1, mid, hi)
+
+        self._pull(node, lo, hi)
+
+    def _pull(self, node, lo, hi):
+        full = self.ys[hi] - self.ys[lo]
+        leaf = hi - lo == 1
+        (left, right) = (2 * node, 2 * node + 1)
+        below_once = 0 if leaf else self.once[left] + self.once[right]
+        below_twice = 0 if leaf else self.twice[left] + self.twice[right]
+
+        if self.cover[node] >= 2:
+            self.once[node] = full
+            self.twice[node] = full
+        elif self.cover[node] == 1:
+            self.once[node] = full
+            self.twice[node] = below_once
+        else:
+            self.once[node] = below_once
+            self.twice[node] = below_twice
+
+    def covered_twice(self):
+        return self.twice[1]
+
+
+class IntervalIndex:
+    """
+    Dynamic multiset of intervals over compressed coordinates. Each
+    interval is counted at the O(log n) segment tree nodes that exactly
+    cover it, which supports two O(log n) queries: whether any interval
+    overlaps a given one, and whether an interval has been overlapped by
+    any touched after it was added.
+
+    The second works through lazy touched stamps rather than by collecting
+    the intervals. touch(l, r, stamp) stamps each node it visits, and the
+    nodes covering [l, r) also stand for their whole subtree. An interval
+    is overlapped by a later touch exactly when one of its nodes, or an
+    ancestor of one covered by the touch, carries a newer stamp, which
+    remove() checks on the way down.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        nodes = 4 * max(size, 1)
+        self.stored = [0] * nodes  # intervals stored at each node
+        self.active = [0] * nodes  # intervals stored in each subtree
+        self.touched = [-1] * nodes  # latest touch through each node
+        self.covered = [-1] * nodes  # latest touch covering each subtree
+
+    def _apply(self, l, r, delta, since=None, node=1, lo=0, hi=None, seen=-1):
+        """
+        Add delta to the count of [l, r). Return True if since is given
+        and [l, r) has been touched after it.
+        """
+        if hi is None:
+            hi = self.size
+        if r <= lo or hi <= l:
+            return False
+
+        self.active[node] += delta
+        seen = max(seen, self.covered[node])
+        if l <= lo and hi <= r:
+            self.stored[node] += delta
+            return since is not None and max(seen, self.touched[node]) > since
+
+        mid = (lo + hi) // 2
+        left = self._apply(l, r, delta, since, 2 * node, lo, mid, seen)
+        right = self._apply(l, r, delta, since, 2 * node + 1, mid, hi, seen)
+
+        return left or right
+
+    def add(self, l, r):
+        self._apply(l, r, 1)
+
+    def remove(self, l, r, since=None):
+        """
+        Remove [l, r). Return True if it was touched after since.
+        """
+        return self._apply(l, r, -1, since)
+
+    def overlaps(self, l, r, node=1, lo=0, hi=None):
+        """
+        Return True if any interval overlaps [l, r), stopping at the first.
+        """
+        if hi is None:
+            hi = self.size
+        if r <= lo or hi <= l or not self.active[node]:
+            return False
+        if self.stored[node] or l <= lo and hi <= r:
+            return True
+
+        mid = (lo + hi) // 2
+        return (
+            self.overlaps(l, r, 2 * node, lo, mid)
+            or self.overlaps(l, r, 2 * node + 1, mid, hi)
+        )
+
+    def touch(self, l, r, stamp, node=1, lo=0, hi=None):
+        """
+        Mark every interval now overlapping [l, r) as touched at stamp.
+        """
+        if hi is None:
+            hi = self.size
+        if r <= lo or hi <= l or not self.active[node]:
+            return
+
+        self.touched[node] = stamp
+        if l <= lo and hi <= r:
+            self.covered[node] = stamp
+            return
+
+        mid = (lo + hi) // 2
+        self.touch(l, r, stamp, 2 * node, lo, mid)
+        self.touch(l, r, stamp, 2 * node + 1, mid, hi)
+
+
+class SweepFabric:
+    """
+    Sweep-line alternative to Fabric, for claims spread over a coordinate
+    space too large for a dense grid.
+
+    Claims are swept left to right by their vertical edges, with the y
+    coordinates compressed to the distinct claim edges. A CoverageTree
+    gives the length covered twice at each x, so the disputed area takes
+    O(n log n) for n claims however large they are. A second sweep keeps
+    the claims crossing the sweep line in an IntervalIndex: a new claim is
+    disputed if any active claim overlaps it in y, and touches all those
+    claims in turn, so finding every disputed claim is O(n log n) too.
+
+    Only claims that have been reserved, or that cover no points, are
+    answered by is_undisputed(); any other claim counts as disputed.
+    """
+
+    def __init__(self):
+        self.claims = []
+        self.area = None
+        self.undisputed = None
+
+    def reserve(self, claim):
+        self.claims.append(claim)
+        self.area = None
+        self.undisputed = None
+
+    def _events(self):
+        """
+        Return the compressed y coordinates, and the sweep events as
+        (x, delta, index into claims) with removals ordered before
+        additions at the same x, as claims are half-open. Claims covering
+        no points take no part.
+        """
+        claims = [
+            (index, claim)
+            for (index, claim) in enumerate(self.claims)
+            if claim.size[0] > 0 and claim.size[1] > 0
+        ]
+        ys = sorted({
+            y
+            for (_, claim) in claims
+            for y in (claim.origin[1], claim.origin[1] + claim.size[1])
+        })
+        events = []
+        for (index, claim) in claims:
+            events.append((claim.origin[0], 1, index))
+            events.append((claim.origin[0] + claim.size[0], -1, index))
+        events.sort()
+
+        return (ys, events)
+
+    def _span(self, ys, claim):
+        return (
+            bisect_left(ys, claim.origin[1]),
+            bisect_left(ys, claim.origin[1] + claim.size[1])
+        )
+
+    def disputed(self):
+        """
+        Return the number of points that are subject to more than one claim.
+        """
+        if self.area is None:
+            (ys, events) = self._events()
+            tree = CoverageTree(ys)
+            self.area = 0
+            previous = None
+            for (x, delta, index) in events:
+                if previous is not None:
+                    self.area += tree.covered_twice() * (x - previous)
+                (l, r) = self._span(ys, self.claims[index])
+                tree.update(l, r, delta)
+                previous = x
+
+        return self.area
+
+    def _find_undisputed(self):
+        """
+        Return the (origin, size) of every claim overlapping no other.
+        """
+        (ys, events) = self._events()
+        index = IntervalIndex(len(ys))
+        added = {}
+        disputed = set()
+        for (stamp, (_, delta, claim_index)) in enumerate(events):
+            (l, r) = self._span(ys, self.claims[claim_index])
+            if delta < 0:
+                if index.remove(l, r, added.pop(claim_index)):
+                    disputed.add(claim_index)
+                continue
+
+            if index.overlaps(l, r):
+                disputed.add(claim_index)
+                index.touch(l, r, stamp)
+            added[claim_index] = stamp
+            index.add(l, r)
+
+        return {
+            (claim.origin, claim.size)
+            for (claim_index, claim) in enumerate(self.claims)
+            if claim_index not in disputed
+        }
+
+    def is_undisputed(self, claim):
+        """
+        Return True if the claim is completely undisputed.
+        """
+        if claim.size[0] <= 0 or claim.size[1] <= 0:
+            return True
+
+        if self.undisputed is None:
+            self.undisputed = self._find_undisputed()
+
+        return (claim.origin, claim.size) in self.undisputed
+
+
+def read_data(filename="data/input3.data", stream=False):
+    """
+    Load the raw datafile. With stream=True, return an iterator that reads
+    the lines lazily from a memory map instead.
+    """
+    if stream:
+        return mmap_lines(filename, decode)
+
     with open(filename) as f:
         lines = f.read().splitlines()
 
     return lines
 
 
-def parse_data(lines):
+def iter_claims(lines):
     """
     A claim like #123 @ 3,2: 5x4 means that claim ID 123 specifies a
     rectangle 3 inches from the left edge, 2 inches from the top edge,
@@ -76,17 +436,18 @@ def parse_data(lines):
     # 11 @ 49,318: 25x25
     """
     patt = re.compile(r"^#(\s*\d+)\s+@\s+(\d+),(\d+):\s+(\d+)x(\d+)")
-    result = []
     for line in lines:
         m = patt.match(line)
         if m:
-            result.append(Claim(
+            yield Claim(
                 id=int(m.group(1)),
                 origin=(int(m.group(2)), int(m.group(3))),
                 size=(int(m.group(4)), int(m.group(5)))
-            ))
+            )
+
 
-    return result
+def parse_data(lines):
+    return list(iter_claims(lines))
 
 
 def part1(fabric, claims):
@@ -106,10 +467,34 @@ def part2(fabric, claims):
     return [claim for claim in claims if fabric.is_undisputed(claim)]
 
 
-if __name__ == "__main__":
-    claims = parse_data(read_data())
-    fabric = Fabric()
+def stream_claims(filename):
+    return iter_claims(read_data(filename, stream=True))
+
+
+def solve_part1(filename="data/input3.data"):
+    return part1(SweepFabric(), stream_claims(filename))
+
 
-    print(f"Part1: {part1(fabric, claims)}")
-    for undisputed in part2(fabric, claims):
-        print(f"Part2: {undisputed.id}")
+def solve_part2(filename="data/input3.data"):
+    """
+    Return the id of the one undisputed claim. The claims are streamed
+    twice, once to fill the fabric and once to check them against it.
+    Raises ValueError unless exactly one claim is undisputed.
+    """
+    fabric = SweepFabric()
+    part1(fabric, stream_claims(filename))
+
+    undisputed = [
+        claim.id for claim in part2(fabric, stream_claims(filename))
+    ]
+    if len(undisputed) != 1:
+        raise ValueError(
+            f"expected one undisputed claim, found {len(undisputed)}"
+        )
+
+    return undisputed[0]
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -3,16 +3,48 @@ day 4 of Advent of Code 2018
 by Stefan Kruger
 """
 
-from collections import Counter, defaultdict
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import accumulate
 
 import re
 
 
+MINUTES = 60
+
+
+def set_minutes(mask):
+    """
+    Yield the minutes whose bits are set in a sleep mask, in order.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
 class GuardRecord:
+    """
+    One guard's shift. Bit m of mask is set if the guard was asleep at
+    00:m.
+    """
+
     def __init__(self, date, guard):
         self.date = date
         self.guard = guard
-        self.asleep = [0] * 60
+        self.mask = 0
+
+    def sleep(self, start, end):
+        """
+        Mark the guard as asleep from minute start up to, but not
+        including, minute end.
+        """
+        if end > start:
+            self.mask |= ((1 << (end - start)) - 1) << start
+
+    @property
+    def asleep(self):
+        return [(self.mask >> minute) & 1 for minute in range(MINUTES)]
 
     def tostr(self):
         s = "".join([
@@ -22,13 +54,35 @@ class GuardRecord:
         return f"{self.date} {self.guard} {s}"
 
     def minutes_asleep(self):
-        return sum(self.asleep)
+        return bin(self.mask).count("1")
+
+
+# Log lines hold fixed-width fields, e.g.
+#
+#     [1518-11-01 23:51] Guard #1697 begins shift
+#
+# so the entry type can be told from the character at KIND, and minutes and
+# guard ids can be sliced out without matching regexes.
+DATE = slice(6, 11)
+MINUTE = slice(15, 17)
+KIND = 19
+GUARD_ID = 26
 
 
 class GuardRota:
+    """
+    The guards' shifts, in log order. Each guard's total minutes asleep and
+    per-minute sleep histogram are kept up to date as records are added, so
+    neither part needs another pass over the rota. Histograms are held as
+    difference arrays, +1 where a nap starts and -1 where it ends, so adding
+    a record costs one update per nap rather than per minute.
+    """
+
     def __init__(self):
         self.rota = []
         self.per_guard = defaultdict(list)
+        self.totals = {}
+        self.changes = {}
 
     @classmethod
     def from_list(cls, lines):
@@ -42,6 +96,42 @@ class GuardRota:
         """
         rota = cls()
 
+        guard = None
+        sleep_min = None
+
+        # The timestamp leads each line, so a plain sort is in log order.
+        for entry in sorted(lines):
+            if not entry:
+                continue
+
+            kind = entry[KIND]
+            if kind == "G":
+                if guard:
+                    rota.add_record(guard)
+
+                guard = GuardRecord(
+                    date=entry[DATE],
+                    guard=int(entry[GUARD_ID:entry.index(" ", GUARD_ID)])
+                )
+            elif kind == "f":
+                sleep_min = int(entry[MINUTE])
+            elif kind == "w":
+                guard.sleep(sleep_min, int(entry[MINUTE]))
+            else:
+                raise ValueError(f"bad log entry: {entry!r}")
+
+        rota.add_record(guard)
+
+        return rota
+
+    @classmethod
+    def from_list_reference(cls, lines):
+        """
+        Original parser: sort the lines as strings and match each against
+        up to three regexes. Kept to check from_list() against.
+        """
+        rota = cls()
+
         shift_start = re.compile(
             r"(\d{4})-(\d{2})-(\d{2})\s(\d{2}):(\d{2})]\s+Guard\s+#(\d+)"
         )
@@ -75,7 +165,7 @@ class GuardRota:
             m = wakes_up.search(entry)
             if m:
                 wake_min = int(m.group(5))
-                guard.asleep[sleep_min:wake_min] = [1] * (wake_min - sleep_min)
+                guard.sleep(sleep_min, wake_min)
 
         rota.add_record(guard)
 
@@ -84,6 +174,30 @@ class GuardRota:
     def add_record(self, guard_record):
         self.rota.append(guard_record)
         self.per_guard[guard_record.guard].append(len(self.rota) - 1)
+        self.tally(guard_record, 1)
+
+    def tally(self, guard_record, sign):
+        """
+        Add (sign 1) or retract (sign -1) a record's minutes asleep to its
+        guard's total and histogram.
+        """
+        guard = guard_record.guard
+        if guard not in self.totals:
+            self.totals[guard] = 0
+            self.changes[guard] = [0] * (MINUTES + 1)
+
+        self.totals[guard] += sign * guard_record.minutes_asleep()
+        changes = self.changes[guard]
+        mask = guard_record.mask
+        for minute in set_minutes(mask ^ (mask << 1)):
+            changes[minute] += sign if (mask >> minute) & 1 else -sign
+
+    def histogram(self, guard):
+        """
+        Return the number of shifts in which guard was asleep at each
+        minute.
+        """
+        return list(accumulate(self.changes[guard][:MINUTES]))
 
     def guard_records(self, guard):
         for i in self.per_guard[guard]:
@@ -101,21 +215,11 @@ class GuardRota:
         minute where this guard slept most frequently over the rota.
         Return the product.
         """
-        sleeps = Counter()
-        for entry in self.rota:
-            sleeps[entry.guard] += entry.minutes_asleep()
-
-        guard = sleeps.most_common(1)[0][0]
+        guard = max(self.totals, key=self.totals.__getitem__)
 
         # Find the most commonly slept minute for guard
-        sleep_minute = Counter()
-        for entry in self.rota:
-            if entry.guard == guard:
-                for minute, asleep in enumerate(entry.asleep):
-                    if asleep:
-                        sleep_minute[minute] += 1
-
-        minute = sleep_minute.most_common(1)[0][0]
+        histogram = self.histogram(guard)
+        minute = max(range(MINUTES), key=histogram.__getitem__)
 
         return guard * minute
 
@@ -126,18 +230,138 @@ class GuardRota:
         """
         best = (0, None, None)
         for guard_id in self.guards():
-            minutes = [0] * 60
-            for record in self.guard_records(guard_id):
-                for index, asleep in enumerate(record.asleep):
-                    if asleep:
-                        minutes[index] += 1
-            max_idx, count = max(enumerate(minutes), key=lambda v: v[1])
+            minutes = self.histogram(guard_id)
+            max_idx = max(range(MINUTES), key=minutes.__getitem__)
+            count = minutes[max_idx]
             if count >= best[0]:
                 best = (count, guard_id, max_idx)
 
         return best[1] * best[2]
 
 
+class StreamingRota(GuardRota):
+    """
+    A GuardRota fed one log entry at a time, in any order, as when tailing
+    a log.
+
+    Entries are buffered in log order, with the shift starts indexed
+    separately. A new entry belongs to the latest shift starting before it.
+    A new shift start takes over any later entries of the shift before it.
+    Each shift affected by an entry is rebuilt from its buffered entries.
+    Its old record is retracted from the totals and histograms and the new
+    one tallied. Shifts no entry touches are never revisited, so part1 and
+    part2 stay current at a cost per entry that depends only on the size
+    of its shift. Entries before the first known shift start wait in the
+    buffer until their shift turns up.
+
+    Without finalise(), every entry stays buffered, since any shift could
+    still gain one, and the buffers grow with the whole log. Calling
+    finalise(until) once all entries before until have arrived closes the
+    shifts that are then complete: their entries are dropped and their
+    records move to the front of the rota, indexed in per_guard like a
+    GuardRota's. Buffering then costs O(open shifts) per entry rather than
+    O(log length).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+        self.starts = []
+        self.closed = 0  # finalised records at the front of rota
+        self.until = None
+
+    def feed(self, lines):
+        for line in lines:
+            self.add_entry(line)
+
+        return self
+
+    def add_entry(self, line):
+        if not line:
+            return
+        if line[KIND:KIND + 1] not in ("G", "f", "w"):
+            raise ValueError(f"bad log entry: {line!r}")
+        if self.until is not None and line < self.until:
+            raise ValueError(f"log entry for a finalised shift: {line!r}")
+
+        insort(self.entries, line)
+        if line[KIND] == "G":
+            index = bisect_left(self.starts, line)
+            self.starts.insert(index, line)
+            self.rota.insert(self.closed + index, None)
+            if index > 0:
+                self.refresh(index - 1)
+            self.refresh(index)
+        else:
+            index = bisect_right(self.starts, line) - 1
+            if index >= 0:
+                self.refresh(index)
+
+    def finalise(self, until):
+        """
+        Declare that every entry sorting before until, a log line or a
+        prefix of one such as "[1518-11-05", has arrived. Shifts followed
+        by a shift start before until are closed and their entries dropped,
+        as are entries that no shift start can now claim. Later entries
+        before until raise ValueError.
+        """
+        if self.until is not None and until <= self.until:
+            return
+        self.until = until
+
+        known = bisect_left(self.starts, until)
+        if known == 0:
+            del self.entries[:bisect_left(self.entries, until)]
+            return
+
+        del self.entries[:bisect_left(self.entries, self.starts[known - 1])]
+        for record in self.rota[self.closed:self.closed + known - 1]:
+            self.per_guard[record.guard].append(self.closed)
+            self.closed += 1
+        del self.starts[:known - 1]
+
+    def refresh(self, index):
+        """
+        Rebuild the record of the open shift at index from its buffered
+        entries. A nap is only counted once both its ends have arrived.
+        """
+        start = self.starts[index]
+        first = bisect_right(self.entries, start)
+        if index + 1 < len(self.starts):
+            last = bisect_left(self.entries, self.starts[index + 1], first)
+        else:
+            last = len(self.entries)
+
+        record = GuardRecord(
+            date=start[DATE],
+            guard=int(start[GUARD_ID:start.index(" ", GUARD_ID)])
+        )
+        sleep_min = None
+        for entry in self.entries[first:last]:
+            if entry[KIND] == "f":
+                sleep_min = int(entry[MINUTE])
+            elif sleep_min is not None:
+                record.sleep(sleep_min, int(entry[MINUTE]))
+                sleep_min = None
+
+        index += self.closed
+        if self.rota[index] is not None:
+            self.tally(self.rota[index], -1)
+        self.rota[index] = record
+        self.tally(record, 1)
+
+    def guard_records(self, guard):
+        # Open shifts can still be inserted anywhere, so only the closed
+        # ones are in per_guard.
+        yield from super().guard_records(guard)
+        for record in self.rota[self.closed:]:
+            if record.guard == guard:
+                yield record
+
+    def guards(self):
+        return self.totals.keys()
+
+
 def read_data(filename="data/input4.data"):
     """
     Load the raw datafile
@@ -148,10 +372,14 @@ def read_data(filename="data/input4.data"):
     return lines
 
 
-if __name__ == "__main__":
-    data = read_data()
+def solve_part1(filename="data/input4.data"):
+    return GuardRota.from_list(read_data(filename)).part1()
+
 
-    rota = GuardRota.from_list(data)
+def solve_part2(filename="data/input4.data"):
+    return GuardRota.from_list(read_data(filename)).part2()
 
-    print(f"Part1: {rota.part1()}")
-    print(f"Part2: {rota.part2()}")
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -2,37 +2,168 @@
 day 5 of Advent of Code 2018
 by Stefan Kruger
 """
-import concurrent.futures
-import re
 import string
 
+# Polymers shorter than this (in units) aren't worth farming out to worker
+# processes.
+PARALLEL_THRESHOLD = 1 << 22
+
+
+def reacts(a, b):
+    """
+    Return True if units a and b react: the same letter in different
+    cases. ASCII letters differ from their other case only in bit 5, so
+    they must XOR to 32, and be letters.
+    """
+    return a ^ b == 32 and 0x61 <= (a | 32) <= 0x7a
+
+
+def reduce_units(units):
+    """
+    Return the units left once a sequence has fully reacted, found in a
+    single pass by keeping the survivors so far on a stack: each unit
+    either annihilates the top of the stack or is pushed on to it.
+    """
+    stack = bytearray()
+    push = stack.append
+    pop = stack.pop
+    top = None
+    for unit in units:
+        # reacts(top, unit), inlined as this is the hot loop
+        if (
+            top is not None and top ^ unit == 32
+            and 0x61 <= (unit | 32) <= 0x7a
+        ):
+            pop()
+            top = stack[-1] if stack else None
+        else:
+            push(unit)
+            top = unit
+
+    return stack
+
+
+def merge(stack, chunk):
+    """
+    Append a fully reacted chunk to a fully reacted stack of units. Only
+    units at the join can react: the chunk's leading units cancel the
+    stack's top ones for as long as they match.
+    """
+    skip = 0
+    while skip < len(chunk) and stack and reacts(stack[-1], chunk[skip]):
+        stack.pop()
+        skip += 1
+
+    stack += chunk[skip:]
+
+
+# The units shared with reduce_parallel()'s worker processes
+shared_units = None
+
+
+def share_units(units):
+    """
+    Worker initialiser for reduce_parallel(): keep hold of the shared
+    array of units, which is inherited rather than pickled.
+    """
+    global shared_units
+    shared_units = units
+
+
+def reduce_chunk(start, end):
+    """
+    Worker for reduce_parallel(): reduce units[start:end] of the shared
+    array, write the result back to the start of the span and return its
+    length.
+    """
+    with memoryview(shared_units).cast("B") as view:
+        with view[start:end] as span:
+            reduced = reduce_units(span)
+            span[:len(reduced)] = reduced
+
+    return len(reduced)
+
+
+def reduce_parallel(units, jobs):
+    """
+    Fully react units by splitting them into a chunk per job, reducing the
+    chunks in worker processes and then merging the reduced chunks in
+    order. Reaction is associative, so this gives the same result as a
+    single pass. The units are copied once into a shared array, and each
+    worker reduces its chunk in place, so only offsets and lengths pass
+    between processes.
+    """
+    # Imported here rather than at the top, as only the parallel mode
+    # needs them.
+    import concurrent.futures
+    from multiprocessing import RawArray
+
+    size = len(units)
+    shared = RawArray("B", max(size, 1))
+    with memoryview(shared).cast("B") as view:
+        view[:size] = units
+        step = -(-size // jobs) or 1
+        starts = range(0, size, step)
+        ends = [min(start + step, size) for start in starts]
+
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=share_units, initargs=(shared,)
+        )
+        with pool as executor:
+            lengths = list(executor.map(reduce_chunk, starts, ends))
+
+        stack = bytearray()
+        for (start, length) in zip(starts, lengths):
+            with view[start:start + length] as chunk:
+                merge(stack, chunk)
+
+    return stack
+
 
 class Polymer:
+    """
+    A polymer held as a bytearray of units. Two adjacent units react if
+    they're the same type with opposite polarity, i.e. the same letter in
+    different cases; see reacts().
+    """
+
     def __init__(self, composition):
-        self.composition = composition
-        self.pattern = re.compile(
-            r"(aA|bB|cC|dD|eE|fF|gG|hH|iI|jJ|kK|lL|mM|"
-            r"nN|oO|pP|qQ|rR|sS|tT|uU|vV|wW|xX|yY|zZ|"
-            r"Aa|Bb|Cc|Dd|Ee|Ff|Gg|Hh|Ii|Jj|Kk|Ll|Mm|"
-            r"Nn|Oo|Pp|Qq|Rr|Ss|Tt|Uu|Vv|Ww|Xx|Yy|Zz)"
-        )
+        if isinstance(composition, str):
+            composition = composition.encode("ascii")
+        self.units = bytearray(composition)
+
+    @property
+    def composition(self):
+        return self.units.decode("ascii")
 
     def react(self):
-        result = re.subn(self.pattern, "", self.composition)
-        self.composition = result[0]
-        return result[1] != 0
+        """
+        Fully react the polymer in a single pass. Return True if anything
+        reacted.
+        """
+        stack = reduce_units(self.units)
+        reacted = len(stack) != len(self.units)
+        self.units = stack
+        return reacted
 
-    def reduce_full(self):
-        reaction = self.react()
-        while reaction:
-            reaction = self.react()
+    def reduce_full(self, jobs=1):
+        """
+        Fully react the polymer. With jobs > 1, polymers of at least
+        PARALLEL_THRESHOLD units are reduced in chunks by that many worker
+        processes; see reduce_parallel().
+        """
+        if jobs > 1 and self.size() >= PARALLEL_THRESHOLD:
+            self.units = reduce_parallel(self.units, jobs)
+        else:
+            self.react()
 
     def size(self):
-        return len(self.composition)
+        return len(self.units)
 
     def mutate(self, unit):
-        self.composition = re.sub(
-            unit, '', self.composition, flags=re.IGNORECASE)
+        self.units = self.units.translate(
+            None, delete=(unit.lower() + unit.upper()).encode("ascii")
+        )
 
 
 def read_data(filename="data/input5.data"):
@@ -40,26 +171,43 @@ def read_data(filename="data/input5.data"):
         return f.read().splitlines()[0].rstrip()
 
 
-def proc(polymer):
+def shortest_removal(polymer):
+    """
+    Return the size of the shortest polymer left by removing every unit of
+    one type and fully reacting the rest.
+
+    Removing units never stops a pair that reacts in the original from
+    reacting (it can only bring more pairs together), so the polymer is
+    reduced once and each of the 26 removals starts from that much shorter
+    sequence. Everything runs in this process on the one buffer.
+    """
+    reduced = Polymer(polymer.units)
+    reduced.reduce_full()
+
+    best = reduced.size()
+    for unit in string.ascii_lowercase:
+        candidate = Polymer(reduced.units)
+        candidate.mutate(unit)
+        candidate.reduce_full()
+        best = min(best, candidate.size())
+
+    return best
+
+
+def solve_part1(filename="data/input5.data"):
+    polymer = Polymer(read_data(filename))
     polymer.reduce_full()
     return polymer.size()
 
 
+def solve_part2(filename="data/input5.data"):
+    """
+    Find the shortest polymer that can be produced by removing all units of
+    exactly one type and fully reacting the result.
+    """
+    return shortest_removal(Polymer(read_data(filename)))
+
+
 if __name__ == "__main__":
-    data = read_data()
-    polymer = Polymer(data)
-    polymer.reduce_full()
-    print(f"Part1: {polymer.size()}")
-
-    polymers = []
-    for unit in list(string.ascii_lowercase):
-        polymer = Polymer(data)
-        polymer.mutate(unit)
-        polymers.append(polymer)
-
-    min_size = len(data)
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        for size in executor.map(proc, polymers):
-            if size < min_size:
-                print(size)
-                min_size = size
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -2,8 +2,10 @@
 day 6 of Advent of Code 2018
 by Stefan Kruger
 """
+from array import array
 from collections import Counter
 from dataclasses import dataclass
+from itertools import chain
 import copy
 import re
 
@@ -15,15 +17,44 @@ class Point:
     id: int
 
 
+# Owner of a cell equally close to two or more points.
+TIE = -1
+UNSEEN = -2
+
+# Distance of a DistanceMap cell that hasn't been compared yet.
+UNSET = -(2 ** 31)
+
+
 class DistanceMap:
+    """
+    Best distance so far, and the point it's to, for each cell of a grid.
+    The cells are held in two flat array('i')s indexed by y * xsize + x:
+    owners (TIE when there's no single owner) and distances (negated for a
+    tie, UNSET before any comparison). That's 8 bytes a cell.
+    """
+
     def __init__(self, xsize, ysize):
-        self.data = [
-            [(None, None) for _ in range(0, xsize)]  # (pid, val)
-            for _ in range(0, ysize)
-        ]
+        self.xsize = xsize
+        self.ysize = ysize
+        self.owners = array("i", [TIE]) * (xsize * ysize)
+        self.distances = array("i", [UNSET]) * (xsize * ysize)
+
+    def cell(self, x, y):
+        """
+        Return (pid, val) for a cell, with None for no owner or no value.
+        """
+        index = y * self.xsize + x
+        owner = self.owners[index]
+        distance = self.distances[index]
+        return (
+            None if owner == TIE else owner,
+            None if distance == UNSET else distance
+        )
 
     def set(self, point):
-        self.data[point.y][point.x] = (point.id, 0)
+        index = point.y * self.xsize + point.x
+        self.owners[index] = point.id
+        self.distances[index] = 0
 
     def compare(self, point, td):
         """
@@ -31,14 +62,20 @@ class DistanceMap:
         is lower than the previous best, store this point. If equal, the point
         is contended, denoted with a negative.
         """
-        if self.data[point.y][point.x][1] is None:
-            self.data[point.y][point.x] = (point.id, td)
+        index = point.y * self.xsize + point.x
+        best = self.distances[index]
+
+        if best == UNSET:
+            self.owners[index] = point.id
+            self.distances[index] = td
 
-        elif td == abs(self.data[point.y][point.x][1]):
-            self.data[point.y][point.x] = (None, -td)  # many pts with same td
+        elif td == abs(best):
+            self.owners[index] = TIE  # many pts with same td
+            self.distances[index] = -td
 
-        elif td < abs(self.data[point.y][point.x][1]):
-            self.data[point.y][point.x] = (point.id, td)
+        elif td < abs(best):
+            self.owners[index] = point.id
+            self.distances[index] = td
 
     def _infinites(self):
         """
@@ -46,45 +83,191 @@ class DistanceMap:
         isn't infinite. We can exclude infinite areas by excluding any number
         on the data boundaries (x|y == 0, x==xmax, y=ymax)
         """
+        (xsize, ysize) = (self.xsize, self.ysize)
+        size = xsize * ysize
+        border = chain(
+            range(0, xsize),
+            range(size - xsize, size),
+            range(0, size, xsize),
+            range(xsize - 1, size, xsize)
+        )
+
         infinites = {}
-        for x in range(0, len(self.data[0])):
-            val1 = self.data[0][x]
-            val2 = self.data[len(self.data)-1][x]
-            if val1[1] is not None and val1[1] >= 0:
-                infinites[val1[0]] = True
-            if val2[1] is not None and val2[1] >= 0:
-                infinites[val2[0]] = True
-
-        for y in range(0, len(self.data)):
-            val1 = self.data[y][0]
-            val2 = self.data[y][len(self.data[0])-1]
-            if val1[1] is not None and val1[1] >= 0:
-                infinites[val1[0]] = True
-            if val2[1] is not None and val2[1] >= 0:
-                infinites[val2[0]] = True
+        for index in border:
+            distance = self.distances[index]
+            if distance != UNSET and distance >= 0:
+                infinites[self.owners[index]] = True
 
         return infinites
 
     def areas(self):
         infs = self._infinites()
-        squares = Counter()
+        squares = Counter(self.owners)
+        del squares[TIE]
+        for point_id in infs:
+            del squares[point_id]
+
+        return squares
+
+
+class Voronoi:
+    """
+    The nearest point to each cell of an Area's bounding box, found by a
+    breadth-first search from every point at once, one distance layer at a
+    time. Manhattan shortest paths between cells of the box stay within
+    it, so layer d holds exactly the cells at distance d from their
+    nearest point.
+
+    A cell reached in the same layer from two different owners, or from a
+    cell that is already a tie, is itself a tie. owners and distances are
+    flat array('i')s indexed by y * xsize + x, so memory is O(area) and the
+    search is O(area) too.
+    """
+
+    def __init__(self, owners, distances, xsize, ysize):
+        self.owners = owners
+        self.distances = distances
+        self.xsize = xsize
+        self.ysize = ysize
+
+    @classmethod
+    def from_area(cls, area):
+        (xsize, ysize) = (area.xsize, area.ysize)
+        owners = array("i", [UNSEEN]) * (xsize * ysize)
+        distances = array("i", [-1]) * (xsize * ysize)
+
+        frontier = []
+        for point in area.points:
+            index = point.y * xsize + point.x
+            if owners[index] == UNSEEN:
+                owners[index] = point.id
+                distances[index] = 0
+                frontier.append(index)
+            else:
+                owners[index] = TIE  # two points at the same place
+
+        last = xsize - 1
+        size = xsize * ysize
+        distance = 0
+        while frontier:
+            distance += 1
+            layer = []
+            for index in frontier:
+                owner = owners[index]
+                x = index % xsize
+                for (neighbour, inside) in (
+                    (index - 1, x > 0),
+                    (index + 1, x < last),
+                    (index - xsize, index >= xsize),
+                    (index + xsize, index + xsize < size)
+                ):
+                    if not inside:
+                        continue
+                    reached = distances[neighbour]
+                    if reached < 0:
+                        distances[neighbour] = distance
+                        owners[neighbour] = owner
+                        layer.append(neighbour)
+                    elif reached == distance and owners[neighbour] != owner:
+                        owners[neighbour] = TIE
+            frontier = layer
+
+        return cls(owners, distances, xsize, ysize)
+
+    def owner(self, x, y):
+        return self.owners[y * self.xsize + x]
+
+    def ties(self):
+        """
+        Return the number of cells equally close to more than one point.
+        """
+        return self.owners.count(TIE)
+
+    def infinites(self):
+        """
+        Return the ids of the points whose areas are infinite: any that own
+        a cell on the edge of the bounding box.
+        """
+        (xsize, ysize) = (self.xsize, self.ysize)
+        edges = (
+            self.owners[:xsize],
+            self.owners[(ysize - 1) * xsize:],
+            self.owners[::xsize],
+            self.owners[xsize - 1::xsize]
+        )
 
-        for y in range(0, len(self.data)):
-            for x in range(0, len(self.data[0])):
-                item = self.data[y][x]
-                if item[0] is None or item[0] in infs:
-                    continue
-                squares[item[0]] += 1
+        return {owner for edge in edges for owner in edge if owner != TIE}
+
+    def areas(self):
+        """
+        Return a Counter of the number of cells owned by each point with a
+        finite area.
+        """
+        squares = Counter(self.owners)
+        del squares[TIE]
+        for point_id in self.infinites():
+            del squares[point_id]
 
         return squares
 
 
+def distance_sums(coordinates, pad):
+    """
+    Return the sums of the distances from each position to all the
+    coordinates, for positions from pad before the smallest coordinate to
+    pad after the largest, as an array('q'). Moving one step right adds one
+    for each coordinate already passed and takes one off for each still
+    ahead, so the sums follow from the sorted coordinates in one sweep.
+    """
+    coordinates = sorted(coordinates)
+    count = len(coordinates)
+    first = coordinates[0] - pad
+
+    sums = array("q")
+    current = sum(coordinates) - first * count
+    passed = 0
+    for position in range(first, coordinates[-1] + pad + 1):
+        sums.append(current)
+        while passed < count and coordinates[passed] <= position:
+            passed += 1
+        current += passed - (count - passed)
+
+    return sums
+
+
+def count_pairs_below(first, second, limit):
+    """
+    Count the pairs (a, b), a from first and b from second, with
+    a + b < limit.
+    """
+    first = sorted(first)
+    second = sorted(second)
+    count = 0
+    fitting = len(second)
+    for a in first:
+        while fitting and a + second[fitting - 1] >= limit:
+            fitting -= 1
+        if not fitting:
+            break
+        count += fitting
+
+    return count
+
+
 class Area:
-    def __init__(self, points, area, xmin, ymin):
+    """
+    The points, shifted so that their bounding box starts at (0, 0). area
+    is a flat array('i') indexed by y * xsize + x, holding the id of the
+    point at each square or -1.
+    """
+
+    def __init__(self, points, area, xmin, ymin, xsize):
         self.area = area
         self.points = points
         self.xmin = xmin
         self.ymin = ymin
+        self.xsize = xsize
+        self.ysize = len(area) // xsize
 
     @classmethod
     def from_coordset(cls, lines):
@@ -115,7 +298,7 @@ class Area:
         xsize = xmax - xmin + 1
         ysize = ymax - ymin + 1
 
-        area = [[-1]*xsize for _ in range(0, ysize)]
+        area = array("i", [-1]) * (xsize * ysize)
 
         for point in points:
             xpos = point.x - xmin
@@ -123,13 +306,13 @@ class Area:
             point.x = xpos
             point.y = ypos
 
-            area[ypos][xpos] = point.id
+            area[ypos * xsize + xpos] = point.id
 
-        return cls(points, area, xmin, ymin)
+        return cls(points, area, xmin, ymin, xsize)
 
     def display(self):
-        for row in self.area:
-            print(row)
+        for start in range(0, len(self.area), self.xsize):
+            print(self.area[start:start + self.xsize].tolist())
 
     def taxi_distance(self, point, xpos, ypos):
         dx = point.x - xpos
@@ -144,10 +327,11 @@ class Area:
 
         for point in self.points:
             pmap = []
-            for ypos in range(0, len(self.area)):
+            for ypos in range(0, self.ysize):
                 rowmap = []
-                for xpos in range(0, len(self.area[ypos])):
-                    if self.area[ypos][xpos] != -1:  # only consider empties
+                for xpos in range(0, self.xsize):
+                    # only consider empties
+                    if self.area[ypos * self.xsize + xpos] != -1:
                         rowmap.append(-1)
                         continue
                     td = self.taxi_distance(point, xpos, ypos)
@@ -157,14 +341,14 @@ class Area:
 
         return points_td
 
+    def voronoi(self):
+        return Voronoi.from_area(self)
+
     def find_winners(self, points_td):
         """
         Given a per-point taxi-distance map, find the overall winners.
         """
-        winners = DistanceMap(
-            xsize=len(self.area[0]),
-            ysize=len(self.area)
-        )
+        winners = DistanceMap(xsize=self.xsize, ysize=self.ysize)
 
         for point_id, td_map in points_td.items():
             for y, row in enumerate(td_map):
@@ -178,12 +362,30 @@ class Area:
 
     def safe_region(self, distance_sum):
         """
-        Find all squares where the sum of the taxi distance to all points is
-        less than or equal to distance.
+        Count the squares where the sum of the taxi distances to all points
+        is less than distance_sum, wherever they are.
+
+        The sum splits into a part depending only on x and a part depending
+        only on y. The column sums and row sums are found separately, out
+        past the bounding box to where any further square must be too far,
+        and the squares are counted from the two sorted lists with a
+        two-pointer sweep. That costs about the width plus the height of
+        the search range rather than its area times the number of points.
+        """
+        pad = distance_sum // len(self.points) + 1
+        columns = distance_sums([point.x for point in self.points], pad)
+        rows = distance_sums([point.y for point in self.points], pad)
+
+        return count_pairs_below(columns, rows, distance_sum)
+
+    def safe_region_reference(self, distance_sum):
+        """
+        Original version: sum the taxi distances to every point for each
+        square of the bounding box in turn.
         """
         region_size = 0
-        for ypos in range(0, len(self.area)):
-            for xpos in range(0, len(self.area[ypos])):
+        for ypos in range(0, self.ysize):
+            for xpos in range(0, self.xsize):
                 point_sum = 0
                 for point in self.points:
                     point_sum += self.taxi_distance(point, xpos, ypos)
@@ -199,11 +401,15 @@ def read_data(filename="data/input6.data"):
         return f.read().splitlines()
 
 
+def solve_part1(filename="data/input6.data"):
+    areas = Area.from_coordset(read_data(filename)).voronoi().areas()
+    return areas.most_common()[0][1]
+
+
+def solve_part2(filename="data/input6.data"):
+    return Area.from_coordset(read_data(filename)).safe_region(10000)
+
+
 if __name__ == "__main__":
-    data = read_data()
-    area = Area.from_coordset(data)
-    points_td = area.dist_map()
-    winners = area.find_winners(points_td)
-    areas = winners.areas()
-    print(f'Part1: {areas.most_common()[0][1]}')
-    print(f'Part2: {area.safe_region(10000)}')
+    print(f'Part1: {solve_part1()}')
+    print(f'Part2: {solve_part2()}')
@@ -2,16 +2,31 @@
 day 7 of Advent of Code 2018
 by Stefan Kruger
 """
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from collections import defaultdict
+from heapq import heapify, heappop, heappush
+from typing import Optional
 import json
 import re
 
 FIXED_TASK_COST = 60
 
 
-def weight(task):
-    return FIXED_TASK_COST + ord(task) - ord("A") + 1
+def weight(task, fixed=None):
+    """
+    Cost of a task: a fixed cost (FIXED_TASK_COST by default) plus its
+    position in the sequence A, B, ..., Z, AA, AB, ..., as spreadsheet
+    columns are numbered. Use functools.partial(weight, fixed=n) for a cost
+    function with another fixed cost.
+    """
+    position = 0
+    for letter in task:
+        if not "A" <= letter <= "Z":
+            raise ValueError(f"no default cost for task {task!r}")
+        position = position * 26 + ord(letter) - ord("A") + 1
+
+    return (FIXED_TASK_COST if fixed is None else fixed) + position
 
 
 def read_data(filename="data/input7.data"):
@@ -27,7 +42,9 @@ def pvl(vertex_list):
 
 
 def parse_data(lines):
-    patt = re.compile(r'Step (.) must be finished before step (.) can begin.')
+    patt = re.compile(
+        r'Step (\S+) must be finished before step (\S+) can begin.'
+    )
     result = []
     for line in lines:
         m = patt.search(line)
@@ -40,14 +57,14 @@ def parse_data(lines):
 @dataclass(unsafe_hash=True)
 class Vertex:
     """
-    Class representing a vertex in a DAG. It holds a "task" (a capital letter)
-    and (for part2) a weight.
+    Class representing a vertex in a DAG. It holds a "task" (a name, such as
+    a capital letter) and (for part2) a weight.
     """
     task: str
-    cost: int = field(init=False)
 
-    def __post_init__(self):
-        self.cost = weight(self.task)
+    @property
+    def cost(self):
+        return weight(self.task)
 
     def __str__(self):
         return self.task
@@ -57,44 +74,52 @@ class Vertex:
 class Job:
     """
     Class representing a Job to be processed by a WorkerPool instance. Each job
-    is a vertex and a measure of the remaning processing time.
+    is a vertex, started at a given second, and the second at which it will
+    be finished. The job takes cost seconds, the vertex's own cost by
+    default, but always at least one.
     """
     vertex: Vertex
-    remaining: int = field(init=False)
+    start: int = 0
+    cost: Optional[int] = None
+    finish: int = field(init=False)
 
     def __post_init__(self):
-        self.remaining = self.vertex.cost
+        cost = self.vertex.cost if self.cost is None else self.cost
+        self.finish = self.start + max(cost, 1)
 
-    def tick(self):
-        """
-        Apply a second's worth of work by decreasing self.remaining.
-        """
-        self.remaining -= 1
-        return self.done()
+    def remaining(self, now):
+        return max(self.finish - now, 0)
 
-    def done(self):
-        return self.remaining == 0
+    def done(self, now):
+        return now >= self.finish
 
 
 class WorkerPool:
     """
-    Simulation of a concurrency pool.
+    Discrete-event simulation of a concurrency pool. Rather than ticking
+    through every second, the pool keeps a heap of (finish time, worker
+    index) for the running jobs and a heap of free worker indexes, and
+    advance() jumps straight to the next completion. Jobs always go to
+    the lowest-numbered free worker.
     """
 
     def __init__(self, size):
         self.workers = [None] * size
         self.size = size
         self.ticks = 0
+        self.free = list(range(size))
+        self.running = []
 
     def done(self):
         """
-        Return any finished jobs, reaping any done workers.
+        Return any finished jobs, in worker order, reaping their workers.
         """
         finished = []
-        for index, job in enumerate(self.workers):
-            if job is not None and job.done():
-                finished.append(job.vertex)
-                self.workers[index] = None
+        while self.running and self.running[0][0] <= self.ticks:
+            (_, index) = heappop(self.running)
+            finished.append(self.workers[index].vertex)
+            self.workers[index] = None
+            heappush(self.free, index)
 
         return finished
 
@@ -102,33 +127,39 @@ class WorkerPool:
         """
         Return True if no workers have active tasks.
         """
-        for worker in self.workers:
-            if worker is not None and not worker.done():
-                return False
-        return True
+        return not self.running
 
     def tick(self):
         """
-        Apply a second's work by subtracting 1 from each of the workers' time
-        to completion.
+        Let a second pass.
         """
         self.ticks += 1
-        for current in self.workers:
-            if current is not None and not current.done():
-                current.tick()
 
-    def add(self, vertex):
+    def advance(self):
+        """
+        Move time on to the next time a job finishes, and return the jobs
+        that finish then, as done() does.
+        """
+        if self.running:
+            self.ticks = max(self.ticks, self.running[0][0])
+
+        return self.done()
+
+    def add(self, vertex, cost=None):
         """
         Add a new worker for a vertex task to the list, if there are any
-        available slots.
+        available slots. The job takes cost seconds, by default the
+        vertex's own cost.
         Returns False if the work load wasn't accepted (blocking).
         """
-        for index, job in enumerate(self.workers):
-            if job is None or job.done():
-                self.workers[index] = Job(vertex)
-                return True
+        if not self.free:
+            return False
 
-        return False
+        index = heappop(self.free)
+        job = Job(vertex, start=self.ticks, cost=cost)
+        self.workers[index] = job
+        heappush(self.running, (job.finish, index))
+        return True
 
     def add_task_list(self, vertex_list):
         """
@@ -145,6 +176,56 @@ class WorkerPool:
         return accepted
 
 
+class Policy(ABC):
+    """
+    Scheduling policy for stepping_order_p2(): free workers take the ready
+    task with the smallest key(vertex), ties broken by name. prepare() is
+    called with the graph and cost function before scheduling starts.
+    """
+
+    def prepare(self, dag, cost):
+        pass
+
+    @abstractmethod
+    def key(self, vertex):
+        pass
+
+
+class Alphabetical(Policy):
+    """
+    The puzzle's policy: ready tasks go out in name order.
+    """
+
+    def key(self, vertex):
+        return vertex.task
+
+
+class LongestFirst(Policy):
+    """
+    Longest processing time first: the most expensive ready task goes out
+    first.
+    """
+
+    def prepare(self, dag, cost):
+        self.cost = cost
+
+    def key(self, vertex):
+        return -self.cost(vertex.task)
+
+
+class CriticalPathFirst(Policy):
+    """
+    The ready task heading the most expensive remaining chain of
+    dependants goes out first.
+    """
+
+    def prepare(self, dag, cost):
+        self.levels = dag.bottom_levels(cost)
+
+    def key(self, vertex):
+        return -self.levels[vertex]
+
+
 class DAG:
     def __init__(self, edge_list):
         self.graph = defaultdict(list)
@@ -176,91 +257,134 @@ class DAG:
 
         return paths
 
+    def in_degrees(self):
+        """
+        Return the number of prerequisites of each vertex.
+        """
+        return {vertex: len(self.prereqs[vertex]) for vertex in self.vertexes}
+
+    def release(self, step, waiting, ready, key=str):
+        """
+        Mark step as complete: any vertex for which it was the last
+        outstanding prerequisite goes on the ready heap, ordered by key
+        and then by name.
+        """
+        for vertex in self.graph.get(step, ()):
+            waiting[vertex] -= 1
+            if not waiting[vertex]:
+                heappush(ready, (key(vertex), vertex.task, vertex))
+
+    def ready_heap(self, waiting, key=str):
+        ready = [
+            (key(vertex), vertex.task, vertex)
+            for (vertex, count) in waiting.items()
+            if not count
+        ]
+        heapify(ready)
+        return ready
+
     def stepping_order(self):
-        (start_list, end) = self.find_start_end()
-        paths = []
-        for start in start_list:
-            paths.extend(self.find_all_paths(start, end))
+        """
+        Kahn's topological sort: repeatedly take the alphabetically first
+        step whose prerequisites are all complete. Each vertex tracks how
+        many of its prerequisites are outstanding, and ready steps are kept
+        in a min-heap on their names, so this is O((V + E) log V).
+        """
+        waiting = self.in_degrees()
+        ready = self.ready_heap(waiting)
 
         order = []
-        while True:
-            available = {path[0] for path in paths if path}
-            if not available:
-                break
-            for s in sorted(available, key=lambda x: x.task, reverse=True):
-                if set(self.prereqs[s]).issubset(order):
-                    step = s
-            for path in paths:
-                if path and path[0] == step:
-                    path.remove(step)
+        while ready:
+            step = heappop(ready)[-1]
             order.append(step)
+            self.release(step, waiting, ready)
+
+        if len(order) != len(self.vertexes):
+            raise ValueError("the task graph has a cycle")
 
         return order
 
     def prerequisites_complete(self, task, prereqs):
         return set(self.prereqs[task]).issubset(prereqs)
 
-    def stepping_order_p2(self, concurrency):
+    def bottom_levels(self, cost=weight):
+        """
+        Return the cost of the most expensive chain of tasks starting at
+        each vertex, including its own cost (at least one second, as for a
+        Job).
+        """
+        levels = {}
+        for vertex in reversed(self.stepping_order()):
+            following = max(
+                (levels[after] for after in self.graph.get(vertex, ())),
+                default=0
+            )
+            levels[vertex] = max(cost(vertex.task), 1) + following
+
+        return levels
+
+    def critical_path(self, cost=weight):
+        """
+        Return the cost of the most expensive chain of dependent tasks: no
+        number of workers can finish sooner.
+        """
+        return max(self.bottom_levels(cost).values(), default=0)
+
+    def lower_bound(self, concurrency, cost=weight):
+        """
+        Return a lower bound on the seconds concurrency workers need: the
+        critical path, or the total work shared perfectly between the
+        workers, whichever is longer.
+        """
+        work = sum(max(cost(vertex.task), 1) for vertex in self.vertexes)
+        return max(self.critical_path(cost), -(-work // concurrency))
+
+    def stepping_order_p2(self, concurrency, cost=weight, policy=None):
         """
         Find the task path and time taken to process the task graph over
-        a set of concurrent workers and a given cost function.
+        a set of concurrent workers and a given cost function, which maps a
+        task name to seconds.
 
-        Task allocation order is determined by the paths, and allocated
-        alphabetically to a set of concurrency workers. Workers apply 1 work
-        unit per second, until their allocated tasks are completed. Completed
-        jobs are added onto the work order list in the order they are completed
-        by the workers, and alphabetically if multiple workers complete in the
-        same second.
+        Tasks whose prerequisites are complete are allocated to a set of
+        concurrency workers in the order the policy gives, alphabetically
+        by default. Workers apply 1 work unit per second, until their
+        allocated tasks are completed. Completed jobs are added onto the
+        work order list in the order they are completed by the workers, and
+        in worker order if multiple workers complete in the same second.
 
         Return the computed task order, and the total number of seconds taken
         to complete all jobs.
         """
+        if policy is None:
+            policy = Alphabetical()
+        policy.prepare(self, cost)
 
-        (start_list, end) = self.find_start_end()
-        paths = []
-        for start in start_list:
-            paths.extend(self.find_all_paths(start, end))
+        waiting = self.in_degrees()
+        ready = self.ready_heap(waiting, policy.key)
 
         order = []
         workers = WorkerPool(concurrency)
 
-        while True:
-            # Find the next set of potential tasks as given by the first
-            # element in any non-empty path.
-            available = {path[0] for path in paths if path}
-
-            # End criterion: no remaining tasks, and all workers have completed
-            # their running tasks.
-            if not available and workers.all_done():
-                break
-
-            # Find the sub-set of available tasks where all their prerequisites
-            # are completed, as given by the task graph.
-            workable = [
-                vertex
-                for vertex in available
-                if self.prerequisites_complete(vertex, order)
-            ]
-
-            # Assign workable tasks alphabetically to any available workers.
-            # Note that this may block, so the accepted task list may be
-            # shorter than the workable list (or empty).
-            accepted = workers.add_task_list(workable)
-
-            # If our workers accepted any new tasks, we remove those from the
-            # graph's paths, as they are now under processing.
-            for step in accepted:
-                for path in paths:
-                    if path and path[0] == step:
-                        path.remove(step)
-
-            # Perform one unit of work across all active workers.
-            workers.tick()
-
-            # Find any completed tasks, and add those to the running order.
-            completed = workers.done()
-            if completed:
-                order.extend(completed)
+        # End criterion: no remaining tasks, and all workers have completed
+        # their running tasks.
+        while ready or not workers.all_done():
+            # Assign ready tasks in policy order to any available workers,
+            # until they're all busy.
+            while ready:
+                step = ready[0][-1]
+                if not workers.add(step, cost(step.task)):
+                    break
+                heappop(ready)
+
+            # Skip to the next time a worker finishes. Add the completed
+            # tasks to the running order, and release the tasks waiting on
+            # them.
+            for step in workers.advance():
+                order.append(step)
+                self.release(step, waiting, ready, policy.key)
+
+        if len(order) != len(self.vertexes):
+            raise ValueError("the task graph has a cycle")
 
         return (order, workers.ticks)
 
@@ -279,29 +403,17 @@ class DAG:
         return (list(has_deps - is_dep), list(is_dep - has_deps)[0])
 
 
+def solve_part1(filename="data/input7.data"):
+    dag = DAG(parse_data(read_data(filename)))
+    return pvl(dag.stepping_order())
+
+
+def solve_part2(filename="data/input7.data", concurrent_workers=5):
+    dag = DAG(parse_data(read_data(filename)))
+    _, seconds = dag.stepping_order_p2(concurrent_workers)
+    return seconds
+
+
 if __name__ == "__main__":
-    concurrent_workers = 5
-    data = read_data()
-    # # --- TEST DATA
-    # data = [
-    #     "Step C must be finished before step A can begin.",
-    #     "Step C must be finished before step F can begin.",
-    #     "Step A must be finished before step B can begin.",
-    #     "Step A must be finished before step D can begin.",
-    #     "Step B must be finished before step E can begin.",
-    #     "Step D must be finished before step E can begin.",
-    #     "Step F must be finished before step E can begin."
-    # ]
-    # FIXED_TASK_COST = 0
-    # concurrent_workers = 2
-    # # --- TEST DATA END
-
-    dag = DAG(parse_data(data))
-    print(f'Part1: {pvl(dag.stepping_order())}')
-
-    order, seconds = dag.stepping_order_p2(concurrent_workers)
-    print(
-        f'Part2: {pvl(order)} took {seconds} seconds with '
-        f'{concurrent_workers} workers and a fixed task cost '
-        f'of {FIXED_TASK_COST}'
-    )
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
@@ -2,6 +2,12 @@
 day 8 of Advent of Code 2018
 by Stefan Kruger
 """
+from array import array
+from itertools import islice
+
+from parsing import read_ints
+
+CHUNK_SIZE = 1 << 16
 
 
 class DataProvider:
@@ -76,10 +82,189 @@ class Node:
         return v
 
 
-if __name__ == "__main__":
-    data = DataProvider.read_file()
-    # data = DataProvider([2, 3, 0, 3, 10, 11, 12, 1, 1, 0, 1, 99, 2, 1, 1, 2])
-    tree = Node.make_node(data)
+class FlatTree:
+    """
+    The tree as a struct of arrays rather than Node objects. Nodes are
+    numbered in the order their headers appear, the root being 0. For node
+    i:
+
+        child_counts[i], meta_counts[i]  from its header
+        child_offsets[i]                 where its children's numbers start
+                                         in children
+        meta_offsets[i]                  where its metadata starts in data
+        values[i]                        its value
+
+    The tree is built with an explicit stack, so depth is limited only by
+    memory, and each node's value is worked out from its children's as soon
+    as its metadata is read, in the same pass.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.child_counts = array("i")
+        self.meta_counts = array("i")
+        self.child_offsets = array("i")
+        self.meta_offsets = array("i")
+        self.children = array("i")
+        self.values = array("q")
+        self.total = 0
+        self._build()
+
+    @classmethod
+    def read_file(cls, filename="data/input8.data"):
+        return cls(read_ints(filename, 1)[0])
+
+    def _open(self, cursor):
+        """
+        Add the node whose header is at cursor, and return its number.
+        """
+        if cursor + 1 >= len(self.data):
+            raise ValueError("tree data ends mid-node")
+
+        node = len(self.child_counts)
+        child_count = self.data[cursor]
+        self.child_counts.append(child_count)
+        self.meta_counts.append(self.data[cursor + 1])
+        self.child_offsets.append(len(self.children))
+        self.meta_offsets.append(-1)
+        self.values.append(0)
+        self.children.extend(array("i", [0]) * child_count)
+        return node
+
+    def _build(self):
+        data = self.data
+        cursor = 0
+        stack = [self._open(cursor)]
+        cursor += 2
+        seen = [0]  # children read so far, for each node on the stack
+
+        while stack:
+            node = stack[-1]
+            if seen[-1] < self.child_counts[node]:
+                child = self._open(cursor)
+                cursor += 2
+                self.children[self.child_offsets[node] + seen[-1]] = child
+                seen[-1] += 1
+                stack.append(child)
+                seen.append(0)
+                continue
+
+            count = self.meta_counts[node]
+            self.meta_offsets[node] = cursor
+            metadata = data[cursor:cursor + count]
+            if len(metadata) != count:
+                raise ValueError("tree data ends mid-node")
+            cursor += count
+
+            self.total += sum(metadata)
+            child_count = self.child_counts[node]
+            if not child_count:
+                self.values[node] = sum(metadata)
+            else:
+                offset = self.child_offsets[node] - 1
+                self.values[node] = sum(
+                    self.values[self.children[offset + index]]
+                    for index in metadata
+                    if 0 < index <= child_count
+                )
+
+            stack.pop()
+            seen.pop()
+
+    def node_children(self, node):
+        start = self.child_offsets[node]
+        return self.children[start:start + self.child_counts[node]]
 
-    print(f'Part1: {tree.meta_sum()}')
-    print(f'Part2: {tree.value()}')
+    def metadata(self, node):
+        start = self.meta_offsets[node]
+        return self.data[start:start + self.meta_counts[node]]
+
+    def meta_sum(self):
+        return self.total
+
+    def value(self, node=0):
+        return self.values[node]
+
+
+def read_tokens(filename="data/input8.data", chunk_size=CHUNK_SIZE):
+    """
+    Yield the numbers in a file one at a time, reading about chunk_size
+    bytes at a time, so that memory use is bounded by the chunk size rather
+    than the file size.
+    """
+    with open(filename, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+
+            # A number at the very end of the block may continue in the
+            # next one; carry it over.
+            block = tail + block
+            numbers = block.split()
+            if block[-1:].isspace() or not numbers:
+                tail = b""
+            else:
+                tail = numbers.pop()
+            yield from map(int, numbers)
+
+        if tail:
+            yield int(tail)
+
+
+def evaluate(tokens):
+    """
+    Return (metadata sum, root value) for a tree given as a stream of
+    numbers, consumed as it's parsed without building the tree.
+
+    The stack holds a frame for each node from the root down to the one
+    being read: its header and the values of the children finished so far.
+    A node's value is worked out as soon as its metadata is read, and
+    passed up to its parent's frame, so memory grows with the depth of the
+    tree (and the number of children per node) rather than its size.
+    """
+    tokens = iter(tokens)
+    total = 0
+
+    try:
+        stack = [(next(tokens), next(tokens), [])]
+        while True:
+            (child_count, meta_count, values) = stack[-1]
+            if len(values) < child_count:
+                stack.append((next(tokens), next(tokens), []))
+                continue
+
+            metadata = list(islice(tokens, meta_count))
+            if len(metadata) != meta_count:
+                raise StopIteration
+            total += sum(metadata)
+
+            if not child_count:
+                value = sum(metadata)
+            else:
+                value = sum(
+                    values[index - 1]
+                    for index in metadata
+                    if 0 < index <= child_count
+                )
+
+            stack.pop()
+            if not stack:
+                return (total, value)
+            stack[-1][2].append(value)
+    except StopIteration:
+        raise ValueError("tree data ends mid-node") from None
+
+
+def solve_part1(filename="data/input8.data"):
+    return evaluate(read_tokens(filename))[0]
+
+
+def solve_part2(filename="data/input8.data"):
+    return evaluate(read_tokens(filename))[1]
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
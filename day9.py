@@ -13,6 +13,7 @@ https://stackoverflow.com/questions/39522787/time-complexity-of-random-access-in
 from collections import Counter
 from dataclasses import dataclass
 from typing import Any
+import re
 
 
 @dataclass
@@ -79,19 +80,46 @@ class CircularList:
         return self.scores.most_common(1)
 
 
-if __name__ == "__main__":
+def read_data(filename="data/input9.data"):
+    """
+    430 players; last marble is worth 71588 points
+    """
+    with open(filename) as f:
+        (players, max_marble) = re.findall(r"\d+", f.read())
+
+    return (int(players), int(max_marble))
+
+
+def play(players, max_marble):
     circle = CircularList()
 
     # Set the zero marble; does not belong to a player
     circle.insert_at_cursor(0)
 
     marble = 1
-    max_marble = 71588  # * 100   # Part2: times 100
     while marble < max_marble:
-        for player in range(430):
+        for player in range(players):
             circle.place(player, marble)
             marble += 1
             if marble > max_marble:
                 break
 
-    print(circle.winner())
+    return circle.winner()
+
+
+def solve_part1(filename="data/input9.data"):
+    (players, max_marble) = read_data(filename)
+    return play(players, max_marble)[0][1]
+
+
+def solve_part2(filename="data/input9.data"):
+    """
+    Part2: the last marble is worth 100 times more.
+    """
+    (players, max_marble) = read_data(filename)
+    return play(players, max_marble * 100)[0][1]
+
+
+if __name__ == "__main__":
+    print(f"Part1: {solve_part1()}")
+    print(f"Part2: {solve_part2()}")
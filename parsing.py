@@ -0,0 +1,110 @@
+"""
+Shared input parsing for the Advent of Code 2018 solutions.
+
+Many puzzle inputs are lines holding a fixed number of integers wrapped in
+punctuation, e.g.
+
+    pos=<61296484,84302508,39845359>, r=73484485
+
+Rather than running re.findall once per line, which builds a small list per
+line, these helpers scan the whole buffer once and pack the integers into a
+flat array('q'). Row i is then values[i * stride:(i + 1) * stride].
+
+For inputs too large to hold as a list of strings, mmap_lines() streams the
+lines of a file from a memory map instead.
+"""
+from array import array
+import mmap
+import os
+import re
+
+INT = re.compile(r"-?\d+")
+BYTES_INT = re.compile(rb"-?\d+")
+
+
+def ints(data, stride=None):
+    """
+    Extract every integer in data (a str, bytes or list of lines) with a
+    single regex scan. Return (values, stride), where values is an
+    array('q'). If stride isn't given, it is the number of integers on the
+    first line. Raises ValueError if the integers don't divide into whole
+    rows.
+    """
+    if isinstance(data, (list, tuple)):
+        data = "\n".join(data)
+
+    (pattern, newline) = (
+        (BYTES_INT, b"\n") if isinstance(data, (bytes, bytearray)) else (INT, "\n")
+    )
+
+    values = array("q", map(int, pattern.findall(data)))
+
+    if stride is None:
+        end = data.find(newline)
+        first = data if end == -1 else data[:end]
+        stride = len(pattern.findall(first)) or 1
+
+    if len(values) % stride:
+        raise ValueError(
+            f"{len(values)} integers don't make rows of {stride}"
+        )
+
+    return (values, stride)
+
+
+def read_ints(filename, stride=None):
+    """
+    Read a whole file in one go and extract its integers, as ints().
+    """
+    with open(filename, "rb") as f:
+        return ints(f.read(), stride)
+
+
+def rows(values, stride):
+    """
+    Split packed values into a list of tuples, one per row.
+    """
+    return list(zip(*[iter(values)] * stride))
+
+
+def mmap_lines(filename, parse=None):
+    """
+    Lazily yield the lines of a file, without line endings, as memoryview
+    slices over a read-only memory map of it. If parse is given, yield
+    parse(line) instead.
+
+    Memory use is independent of the file size. Each line is released once
+    the next one is requested, so use bytes(line) to keep hold of one.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                size = len(mm)
+                start = 0
+                while start < size:
+                    end = mm.find(b"\n", start)
+                    if end == -1:
+                        end = size
+                    stop = end - 1 if end > start and mm[end - 1] == 13 else end
+
+                    with view[start:stop] as line:
+                        yield line if parse is None else parse(line)
+
+                    start = end + 1
+
+
+def decode(line):
+    """
+    Convert a streamed line to str.
+    """
+    return str(line, "utf-8")
+
+
+def to_int(line):
+    """
+    Convert a streamed line like b"+15" to int.
+    """
+    return int(bytes(line))
@@ -0,0 +1,113 @@
+import argparse
+import io
+import types
+
+import pytest  # type: ignore
+
+import aoc
+from aoc import parse_days, parse_importtime, run, run_part
+
+
+@pytest.mark.parametrize(
+    "specs,expected",
+    [
+        (["1"], [1]),
+        (["5-7", "1"], [1, 5, 6, 7]),
+        (["3", "3"], [3]),
+        ([], list(range(1, 26)))
+    ]
+)
+def test_parse_days(specs, expected):
+    assert parse_days(specs) == expected
+
+
+@pytest.mark.parametrize("specs", [["0"], ["26"], ["x"], ["3-x"]])
+def test_parse_days_rejects(specs):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_days(specs)
+
+
+def test_run_part(tmp_path):
+    data = tmp_path / "input1.data"
+    data.write_text("+1\n-2\n+3\n+1\n")
+
+    outcome = run_part(1, 1, str(data))
+    assert outcome.error is None
+    assert outcome.answer == 3
+
+    outcome = run_part(1, 2, str(data))
+    assert outcome.answer == 2
+
+
+def test_run_part_reports_errors(tmp_path):
+    outcome = run_part(1, 1, str(tmp_path / "missing.data"))
+    assert outcome.answer is None
+    assert "FileNotFoundError" in outcome.error
+
+
+def test_run_inline(tmp_path):
+    data = tmp_path / "input1.data"
+    data.write_text("+1\n-1\n")
+    out = io.StringIO()
+
+    outcomes = run([1], [1, 2], jobs=1, filename=str(data), out=out)
+
+    assert [o.answer for o in outcomes] == [0, 0]
+    assert out.getvalue().count("Day  1") == 2
+
+
+def test_missing_part(monkeypatch):
+    monkeypatch.setattr(aoc, "load", lambda day: types.SimpleNamespace())
+
+    assert "has no part 2" in run_part(25, 2).error
+
+    outcome = run_part(25, 2, required=False)
+    assert outcome.skipped
+    assert outcome.error is None
+
+
+def test_run_skips_missing_parts(tmp_path, monkeypatch):
+    data = tmp_path / "input25.data"
+    data.write_text("")
+    module = types.SimpleNamespace(solve_part1=lambda filename: 0)
+    monkeypatch.setattr(aoc, "load", lambda day: module)
+    out = io.StringIO()
+
+    outcomes = run([25], [1, 2], jobs=1, filename=str(data), out=out,
+                   required=False)
+
+    assert not any(o.error for o in outcomes)
+    assert out.getvalue().count("Day 25") == 1
+
+
+def test_main_missing_part(monkeypatch):
+    module = types.SimpleNamespace(solve_part1=lambda: 0)
+    monkeypatch.setattr(aoc, "load", lambda day: module)
+
+    assert aoc.main(["run", "25", "--jobs", "1"]) == 0
+    assert aoc.main(["run", "25", "--jobs", "1", "--part", "2"]) == 1
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:       300 |        300 |     _heapq
+import time:       400 |        700 |   heapq
+import time:      2000 |       2000 |   dataclasses
+import time:       500 |       3200 | day24
+"""
+
+
+def test_parse_importtime():
+    profile = parse_importtime(IMPORTTIME, "day24")
+
+    assert profile.cumulative == pytest.approx(0.0032)
+    assert [name for (_, name) in profile.heaviest] == [
+        "dataclasses", "heapq", "_heapq"
+    ]
+
+
+def test_parse_importtime_missing_module():
+    profile = parse_importtime(IMPORTTIME, "day25")
+    assert profile.cumulative == 0
+    assert profile.heaviest == []
@@ -0,0 +1,34 @@
+import pytest  # type: ignore
+
+from bench import Result, regressions
+
+BASELINE = {
+    "day1@1": {"parse": 0.1, "solve": 1.0, "peak": 1000}
+}
+
+
+@pytest.mark.parametrize(
+    "parse,solve,peak,expected",
+    [
+        (0.1, 1.0, 1000, 0),   # unchanged
+        (0.1, 1.2, 1200, 0),   # within tolerance
+        (0.1, 1.5, 1000, 1),   # slower solve
+        (0.2, 1.0, 1000, 1),   # slower parse
+        (0.1, 1.0, 2000, 1),   # more memory
+        (0.2, 2.0, 2000, 3)
+    ]
+)
+def test_regressions(parse, solve, peak, expected):
+    result = Result("day1", 1, parse, solve, peak)
+    assert len(regressions(result, BASELINE)) == expected
+
+
+def test_no_baseline_entry():
+    result = Result("day2", 1, 10.0, 10.0, 10_000)
+    assert regressions(result, BASELINE) == []
+
+
+def test_timer_noise_ignored():
+    baseline = {"day1@1": {"parse": 0.001, "solve": 0.001, "peak": 1000}}
+    result = Result("day1", 1, 0.002, 0.003, 1000)
+    assert regressions(result, baseline) == []
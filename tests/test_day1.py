@@ -0,0 +1,66 @@
+import random
+
+import pytest  # type: ignore
+
+from day1 import part2, part2_reference, prefix_sums, read_chunks, read_data
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        ([+1, -1], 0),
+        ([+3, +3, +4, -2, -4], 10),
+        ([-6, +3, +8, +5, -6], 5),
+        ([+7, +7, -2, -7, -4], 14),
+        ([+1, -2, +3, +1], 2),
+        ([+5], None)
+    ]
+)
+def test_p2_samples(data, expected):
+    assert part2(data) == expected
+
+
+def bounded_reference(data, passes):
+    """
+    The brute-force search, giving up (returning None) after some passes.
+    """
+    seen = set()
+    current = 0
+    for _ in range(passes):
+        for change in data:
+            if current in seen:
+                return current
+            seen.add(current)
+            current += change
+
+    return None
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_p2_matches_reference(seed):
+    rng = random.Random(seed)
+    data = [rng.randint(-20, 20) for _ in range(rng.randint(1, 30))]
+
+    expected = bounded_reference(data, 2000)
+    assert part2(data) == expected
+    if expected is not None:
+        assert part2_reference(data) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 20])
+def test_read_chunks(tmp_path, chunk_size):
+    data = tmp_path / "input1.data"
+    data.write_text("+15\n-7\n+16\n+1\n-100")
+
+    chunks = list(read_chunks(str(data), chunk_size))
+
+    assert [change for chunk in chunks for change in chunk] == [15, -7, 16, 1, -100]
+
+
+def test_prefix_sums_match_data():
+    data = read_data()
+    (visited, drift) = prefix_sums(read_chunks(chunk_size=100))
+
+    assert drift == sum(data)
+    assert list(visited) == list(prefix_sums([data])[0])
+    assert len(visited) == len(data)
@@ -33,3 +33,11 @@ def test_sample_data():
         c.fill((500, 1))
 
     assert len(c.wet_sand) + len(c.settled) == 57
+
+
+def test_raw_text():
+    raw = Cave.from_data("\n".join(TEST_DATA) + "\n")
+    lines = Cave.from_data(TEST_DATA)
+
+    assert raw.clay == lines.clay
+    assert (raw.xdim, raw.ydim) == (lines.xdim, lines.ydim)
@@ -0,0 +1,72 @@
+import pytest  # type: ignore
+
+import day2
+from day2 import checksum, matching_pairs, part1, part2, part2_reference
+
+P1_DATA = ["abcdef", "bababc", "abbcde", "abcccd", "aabcdd", "abcdee", "ababab"]
+
+P2_DATA = ["abcde", "fghij", "klmno", "pqrst", "fguij", "axcye", "wvxyz"]
+
+
+def test_p1_sample_data():
+    assert part1(P1_DATA) == 12
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "\n".join(P1_DATA) + "\n",
+        "\n".join(P1_DATA),
+        "\n".join(P1_DATA + ["abcdeff", "xx"]) + "\n"  # ragged
+    ]
+)
+@pytest.mark.parametrize("chunk_rows", [2, 1 << 16])
+def test_checksum(tmp_path, monkeypatch, content, chunk_rows):
+    monkeypatch.setattr(day2, "CHUNK_ROWS", chunk_rows)
+    data = tmp_path / "input2.data"
+    data.write_text(content)
+
+    assert checksum(str(data)) == part1(content.splitlines())
+
+
+@pytest.mark.parametrize("end", ["\n", ""])
+def test_checksum_letters_only(tmp_path, end):
+    # The digits repeat, but only the letters a-z count, on every row.
+    content = "\n".join(["aabccc", "abc11d", "xyz222"]) + end
+    data = tmp_path / "input2.data"
+    data.write_text(content)
+
+    assert checksum(str(data)) == part1(["aabccc", "abcd", "xyz"]) == 1
+
+
+@pytest.mark.parametrize("extra", [[], ["q"]])
+def test_checksum_letters_only_ragged(tmp_path, extra):
+    # An unrelated short line sends checksum() down the ragged path, which
+    # must count by the same rule.
+    data = tmp_path / "input2.data"
+    data.write_text("\n".join(["aBBB", "xyzz", "ccc1"] + extra) + "\n")
+
+    assert checksum(str(data)) == part1(["aBBB", "xyzz", "ccc1"]) == 1
+
+
+def test_p2_sample_data():
+    assert part2(P2_DATA) == "fgij"
+    assert part2(P2_DATA) == part2_reference(P2_DATA)
+
+
+def test_p2_no_match():
+    assert part2(["abc", "xyz"]) == ""
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_all_pairs(jobs):
+    data = ["abcd", "abxd", "abcd", "zbcd", "abc", "abcx"]
+
+    pairs = [frozenset(pair) for pair in matching_pairs(data, jobs)]
+
+    assert len(pairs) == 3
+    assert set(pairs) == {
+        frozenset(["abcd", "abxd"]),
+        frozenset(["abcd", "zbcd"]),
+        frozenset(["abcd", "abcx"])
+    }
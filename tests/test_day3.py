@@ -0,0 +1,103 @@
+import random
+
+import pytest  # type: ignore
+
+from day3 import (
+    Claim, DenseFabric, Fabric, SweepFabric, parse_data, part1, part2,
+    solve_part2
+)
+
+TEST_DATA = [
+    "#1 @ 1,3: 4x4",
+    "#2 @ 3,1: 4x4",
+    "#3 @ 5,5: 2x2"
+]
+
+
+@pytest.mark.parametrize("backend", [Fabric, DenseFabric, SweepFabric])
+def test_sample_data(backend):
+    fabric = backend()
+    claims = parse_data(TEST_DATA)
+
+    assert part1(fabric, claims) == 4
+    assert [claim.id for claim in part2(fabric, claims)] == [3]
+
+
+@pytest.mark.parametrize("backend", [DenseFabric, SweepFabric])
+def test_empty_fabric(backend):
+    fabric = backend()
+
+    assert fabric.disputed() == 0
+    assert not fabric.is_undisputed(Claim(1, (0, 0), (1, 1)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_backends_agree(seed):
+    rng = random.Random(seed)
+    claims = [
+        Claim(
+            id=i,
+            origin=(rng.randint(0, 40), rng.randint(0, 40)),
+            size=(rng.randint(1, 10), rng.randint(1, 10))
+        )
+        for i in range(30)
+    ]
+    sparse = Fabric()
+    disputed = part1(sparse, claims)
+    undisputed = part2(sparse, claims)
+    dense = DenseFabric()
+    sweep = SweepFabric()
+
+    assert part1(dense, claims) == disputed
+    assert part2(dense, claims) == undisputed
+    assert part1(sweep, claims) == disputed
+    assert part2(sweep, claims) == undisputed
+    assert not dense.is_undisputed(Claim(99, (100, 100), (1, 1)))
+    assert not sweep.is_undisputed(Claim(99, (100, 100), (1, 1)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_backends_agree_degenerate(seed):
+    # Zero sizes, and ids that repeat.
+    rng = random.Random(seed)
+    claims = [
+        Claim(
+            id=i % 10,
+            origin=(rng.randint(0, 20), rng.randint(0, 20)),
+            size=(rng.randint(0, 6), rng.randint(0, 6))
+        )
+        for i in range(30)
+    ]
+    sparse = Fabric()
+    disputed = part1(sparse, claims)
+    undisputed = part2(sparse, claims)
+
+    for backend in (DenseFabric, SweepFabric):
+        fabric = backend()
+        assert part1(fabric, claims) == disputed
+        assert part2(fabric, claims) == undisputed
+        assert fabric.is_undisputed(Claim(1, (0, 0), (0, 3)))
+
+
+def test_sweep_touching_claims():
+    fabric = SweepFabric()
+    claims = [
+        Claim(1, (0, 0), (2, 2)),
+        Claim(2, (2, 0), (2, 2)),
+        Claim(3, (0, 2), (4, 1)),
+        Claim(4, (10**9, 10**9), (10**6, 10**6)),
+        Claim(5, (10**9 + 10**5, 10**9), (1, 10**6)),
+    ]
+
+    assert part1(fabric, claims) == 10**6
+    assert [claim.id for claim in part2(fabric, claims)] == [1, 2, 3]
+
+
+def test_solve_part2(tmp_path):
+    data = tmp_path / "input3.data"
+    data.write_text("\n".join(TEST_DATA) + "\n")
+    assert solve_part2(str(data)) == 3
+
+    data.write_text("\n".join(TEST_DATA + ["#4 @ 20,20: 1x1"]) + "\n")
+    with pytest.raises(ValueError):
+        solve_part2(str(data))
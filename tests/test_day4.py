@@ -0,0 +1,215 @@
+import random
+
+import pytest  # type: ignore
+
+from day4 import GuardRecord, GuardRota, StreamingRota
+
+TEST_DATA = [
+    "[1518-11-01 00:00] Guard #10 begins shift",
+    "[1518-11-01 00:05] falls asleep",
+    "[1518-11-01 00:25] wakes up",
+    "[1518-11-01 00:30] falls asleep",
+    "[1518-11-01 00:55] wakes up",
+    "[1518-11-01 23:58] Guard #99 begins shift",
+    "[1518-11-02 00:40] falls asleep",
+    "[1518-11-02 00:50] wakes up",
+    "[1518-11-03 00:05] Guard #10 begins shift",
+    "[1518-11-03 00:24] falls asleep",
+    "[1518-11-03 00:29] wakes up",
+    "[1518-11-04 00:02] Guard #99 begins shift",
+    "[1518-11-04 00:36] falls asleep",
+    "[1518-11-04 00:46] wakes up",
+    "[1518-11-05 00:03] Guard #99 begins shift",
+    "[1518-11-05 00:45] falls asleep",
+    "[1518-11-05 00:55] wakes up"
+]
+
+
+def test_sample_data():
+    rota = GuardRota.from_list(TEST_DATA)
+
+    assert rota.part1() == 240
+    assert rota.part2() == 4455
+
+
+def test_sample_data_unsorted():
+    lines = list(TEST_DATA)
+    random.Random(4).shuffle(lines)
+    rota = GuardRota.from_list(lines)
+
+    assert rota.part1() == 240
+    assert rota.part2() == 4455
+
+
+def test_sleep_mask():
+    record = GuardRecord("11-01", 10)
+    record.sleep(5, 25)
+    record.sleep(30, 55)
+    record.sleep(59, 60)
+
+    assert record.minutes_asleep() == 46
+    assert record.asleep == [
+        1 if 5 <= minute < 25 or 30 <= minute < 55 or minute == 59 else 0
+        for minute in range(60)
+    ]
+
+
+def test_histograms():
+    rota = GuardRota.from_list(TEST_DATA)
+
+    assert rota.totals == {10: 50, 99: 30}
+    assert rota.histogram(10)[24] == 2
+    assert rota.histogram(99)[45] == 3
+    assert sum(rota.histogram(99)) == 30
+
+
+def test_parsers_agree():
+    lines = []
+    for year in range(1518, 1521):
+        lines.extend(line.replace("[1518-", f"[{year}-") for line in TEST_DATA)
+    random.Random(13).shuffle(lines)
+
+    rota = GuardRota.from_list(lines)
+    reference = GuardRota.from_list_reference(lines)
+
+    assert [r.tostr() for r in rota.rota] == [r.tostr() for r in reference.rota]
+    assert rota.part1() == reference.part1()
+    assert rota.part2() == reference.part2()
+
+
+def test_bad_entry():
+    with pytest.raises(ValueError):
+        GuardRota.from_list(TEST_DATA + ["[1518-11-05 00:58] dozes off"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_any_order(seed):
+    lines = []
+    for year in range(1518, 1521):
+        lines.extend(line.replace("[1518-", f"[{year}-") for line in TEST_DATA)
+    expected = GuardRota.from_list(lines)
+
+    rng = random.Random(seed)
+    rng.shuffle(lines)
+    rota = StreamingRota()
+    for start in range(0, len(lines), 7):
+        rota.feed(lines[start:start + 7])
+
+    assert [r.tostr() for r in rota.rota] == [r.tostr() for r in expected.rota]
+    assert rota.totals == expected.totals
+    assert rota.part1() == expected.part1()
+    assert rota.part2() == expected.part2()
+
+
+def test_streaming_stays_current():
+    rota = StreamingRota()
+    for (end, entry) in enumerate(TEST_DATA, 1):
+        rota.add_entry(entry)
+        if end == len(TEST_DATA) or TEST_DATA[end][19] == "G":
+            expected = GuardRota.from_list(TEST_DATA[:end])
+            assert rota.totals == expected.totals
+            assert rota.part1() == expected.part1()
+            assert rota.part2() == expected.part2()
+
+
+def test_streaming_late_shift_start():
+    rota = StreamingRota().feed(TEST_DATA[:5] + TEST_DATA[6:])
+    assert rota.totals == {10: 50, 99: 20}
+    assert len(rota.rota) == 4
+
+    rota.add_entry(TEST_DATA[5])
+    assert rota.totals == {10: 50, 99: 30}
+    assert rota.part1() == 240
+    assert rota.part2() == 4455
+
+
+def test_streaming_finalise():
+    lines = []
+    for year in range(1518, 1521):
+        lines.extend(line.replace("[1518-", f"[{year}-") for line in TEST_DATA)
+    expected = GuardRota.from_list(lines)
+
+    # Entries arrive out of order, but never more than a day late.
+    rng = random.Random(7)
+    days = sorted({line[:11] for line in lines})
+    rota = StreamingRota()
+    for (day, today) in enumerate(days):
+        batch = [line for line in lines if line[:11] == today]
+        rng.shuffle(batch)
+        rota.feed(batch)
+        if day > 0:
+            rota.finalise(days[day - 1])
+        assert len(rota.starts) <= 4
+
+    assert rota.closed > 0
+    assert [r.tostr() for r in rota.rota] == [r.tostr() for r in expected.rota]
+    assert rota.totals == expected.totals
+    assert rota.part1() == expected.part1()
+    assert rota.part2() == expected.part2()
+    for guard in expected.guards():
+        assert (
+            [r.tostr() for r in rota.guard_records(guard)]
+            == [r.tostr() for r in expected.guard_records(guard)]
+        )
+
+    with pytest.raises(ValueError):
+        rota.add_entry(lines[0])
+
+
+def test_streaming_finalise_drops_orphans():
+    rota = StreamingRota().feed(TEST_DATA[1:5])
+    rota.finalise("[1518-11-01 23")
+
+    assert rota.entries == []
+    assert rota.totals == {}
+
+    rota.feed(TEST_DATA[5:])
+    assert rota.totals == {10: 5, 99: 30}
+
+
+def test_streaming_unpaired_wake():
+    # The shift's second nap has woken, but not yet fallen asleep.
+    rota = StreamingRota().feed(TEST_DATA[:3] + TEST_DATA[4:5])
+    assert rota.totals == {10: 20}
+
+    rota.add_entry(TEST_DATA[3])
+    assert rota.totals == {10: 45}
+
+
+def reference_totals(lines):
+    """
+    Each guard's minutes asleep from the naps whose shift start, sleep and
+    wake have all arrived, pairing each wake with the sleep just before it
+    in the same shift. A minute counts once per shift.
+    """
+    totals = {}
+    shifts = []
+    sleep_min = None
+    for line in sorted(lines):
+        if line[19] == "G":
+            shifts.append((int(line[26:line.index(" ", 26)]), set()))
+            sleep_min = None
+        elif not shifts:
+            continue
+        elif line[19] == "f":
+            sleep_min = int(line[15:17])
+        elif sleep_min is not None:
+            shifts[-1][1].update(range(sleep_min, int(line[15:17])))
+            sleep_min = None
+
+    for (guard, minutes) in shifts:
+        totals[guard] = totals.get(guard, 0) + len(minutes)
+
+    return totals
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_between_batches(seed):
+    lines = list(TEST_DATA)
+    rng = random.Random(seed)
+    rng.shuffle(lines)
+    rota = StreamingRota()
+    for end in range(3, len(lines) + 3, 3):
+        rota.feed(lines[end - 3:end])
+        expected = reference_totals(lines[:end])
+        assert rota.totals == expected
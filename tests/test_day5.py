@@ -0,0 +1,120 @@
+import random
+
+import pytest  # type: ignore
+
+from day5 import (
+    Polymer, merge, reduce_parallel, reduce_units, shortest_removal
+)
+
+TEST_DATA = "dabAcCaCBAcCcaDA"
+
+
+def reference_size(composition):
+    """
+    Repeatedly remove the first reacting pair until none remain.
+    """
+    units = list(composition)
+    reacted = True
+    while reacted:
+        reacted = False
+        for i in range(len(units) - 1):
+            if units[i] != units[i + 1] and units[i].lower() == units[i + 1].lower():
+                del units[i:i + 2]
+                reacted = True
+                break
+
+    return len(units)
+
+
+def test_sample_data():
+    polymer = Polymer(TEST_DATA)
+    polymer.reduce_full()
+
+    assert polymer.size() == 10
+    assert polymer.composition == "dabCBAcaDA"
+
+
+@pytest.mark.parametrize("unit,size", [("a", 6), ("b", 8), ("c", 4), ("d", 6)])
+def test_mutate(unit, size):
+    polymer = Polymer(TEST_DATA)
+    polymer.mutate(unit)
+    polymer.reduce_full()
+
+    assert polymer.size() == size
+
+
+def test_react_reports_change():
+    polymer = Polymer("aA")
+
+    assert polymer.react()
+    assert polymer.size() == 0
+    assert not polymer.react()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_polymers(seed):
+    rng = random.Random(seed)
+    composition = "".join(rng.choice("aAbBc") for _ in range(200))
+    polymer = Polymer(composition)
+    polymer.reduce_full()
+
+    assert polymer.size() == reference_size(composition)
+
+
+def test_shortest_removal():
+    assert shortest_removal(Polymer(TEST_DATA)) == 4
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_shortest_removal_random(seed):
+    rng = random.Random(seed)
+    composition = "".join(rng.choice("aAbBcCd") for _ in range(200))
+    expected = min(
+        reference_size(composition.replace(unit, "").replace(unit.upper(), ""))
+        for unit in "abcdefghijklmnopqrstuvwxyz"
+    )
+
+    assert shortest_removal(Polymer(composition)) == expected
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_reduce_parallel(seed):
+    rng = random.Random(seed)
+    units = bytearray(rng.choice(b"aAbBcC") for _ in range(5000))
+
+    assert reduce_parallel(units, 3) == reduce_units(units)
+
+
+def test_merge():
+    stack = bytearray(b"abC")
+    merge(stack, b"cBd")
+
+    assert stack == b"ad"
+
+
+@pytest.mark.parametrize(
+    "composition,expected",
+    [("a@`b", "a@`b"), (" ab", " ab"), ("aA ", " "), ("[{aA{[", "[{{[")]
+)
+def test_non_letters_dont_react(composition, expected):
+    polymer = Polymer(composition)
+    polymer.reduce_full()
+
+    assert polymer.composition == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_with_non_letters(seed):
+    rng = random.Random(seed)
+    composition = "".join(rng.choice("aAbB@` {[") for _ in range(200))
+    polymer = Polymer(composition)
+    polymer.reduce_full()
+
+    assert polymer.size() == reference_size(composition)
+
+
+def test_merge_non_letters():
+    stack = bytearray(b"a@")
+    merge(stack, b"`A")
+
+    assert stack == b"a@`A"
@@ -0,0 +1,87 @@
+import random
+
+import pytest  # type: ignore
+
+from day6 import TIE, Area, DistanceMap, Point
+
+TEST_DATA = [
+    "1, 1",
+    "1, 6",
+    "8, 3",
+    "3, 4",
+    "5, 5",
+    "8, 9"
+]
+
+
+def test_sample_data():
+    voronoi = Area.from_coordset(TEST_DATA).voronoi()
+
+    assert voronoi.infinites() == {0, 1, 2, 5}
+    assert voronoi.areas() == {3: 9, 4: 17}
+    assert voronoi.owner(0, 0) == 0
+    assert voronoi.owner(4, 0) == TIE  # (5, 1) in puzzle coordinates
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_voronoi_matches_distance_maps(seed):
+    rng = random.Random(seed)
+    coordinates = rng.sample([(x, y) for x in range(31) for y in range(31)], 12)
+    lines = [f"{x}, {y}" for (x, y) in coordinates]
+    area = Area.from_coordset(lines)
+    voronoi = area.voronoi()
+    winners = area.find_winners(area.dist_map())
+
+    assert voronoi.areas() == winners.areas()
+    assert voronoi.infinites() == set(winners._infinites())
+    for y in range(area.ysize):
+        for x in range(area.xsize):
+            (owner, distance) = winners.cell(x, y)
+            assert voronoi.owner(x, y) == (TIE if owner is None else owner)
+            assert voronoi.distances[y * voronoi.xsize + x] == abs(distance)
+
+
+def test_safe_region_sample():
+    area = Area.from_coordset(TEST_DATA)
+
+    assert area.safe_region(32) == 16
+    assert area.safe_region_reference(32) == 16
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_safe_region_grows(seed):
+    rng = random.Random(seed)
+    lines = [f"{rng.randint(0, 15)}, {rng.randint(0, 15)}" for _ in range(6)]
+    area = Area.from_coordset(lines)
+    limit = rng.randint(1, 150)
+    reach = limit // len(area.points) + 1
+    expected = sum(
+        1
+        for x in range(-reach, 16 + reach)
+        for y in range(-reach, 16 + reach)
+        if sum(abs(p.x - x) + abs(p.y - y) for p in area.points) < limit
+    )
+
+    assert area.safe_region(limit) == expected
+
+
+def test_distance_map_compare():
+    winners = DistanceMap(xsize=3, ysize=2)
+
+    assert winners.cell(1, 1) == (None, None)
+    winners.compare(Point(1, 1, 4), 5)
+    assert winners.cell(1, 1) == (4, 5)
+    winners.compare(Point(1, 1, 7), 5)
+    assert winners.cell(1, 1) == (None, -5)
+    winners.compare(Point(1, 1, 2), 3)
+    assert winners.cell(1, 1) == (2, 3)
+    assert winners._infinites() == {2: True}
+    assert winners.areas() == {}
+
+
+def test_area_layout():
+    area = Area.from_coordset(TEST_DATA)
+
+    assert (area.xsize, area.ysize) == (8, 9)
+    assert area.area[3 * area.xsize + 2] == 3  # (3, 4) in puzzle coordinates
+    assert area.area.count(-1) == 8 * 9 - 6
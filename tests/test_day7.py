@@ -0,0 +1,200 @@
+from functools import partial
+import random
+
+import pytest  # type: ignore
+
+import day7
+from day7 import (
+    DAG, Alphabetical, CriticalPathFirst, LongestFirst, Policy, parse_data,
+    pvl
+)
+
+TEST_DATA = [
+    "Step C must be finished before step A can begin.",
+    "Step C must be finished before step F can begin.",
+    "Step A must be finished before step B can begin.",
+    "Step A must be finished before step D can begin.",
+    "Step B must be finished before step E can begin.",
+    "Step D must be finished before step E can begin.",
+    "Step F must be finished before step E can begin."
+]
+
+
+def test_sample_data():
+    dag = DAG(parse_data(TEST_DATA))
+
+    assert pvl(dag.stepping_order()) == "CABDFE"
+
+
+def test_sample_data_p2(monkeypatch):
+    monkeypatch.setattr(day7, "FIXED_TASK_COST", 0)
+    dag = DAG(parse_data(TEST_DATA))
+    (order, seconds) = dag.stepping_order_p2(2)
+
+    assert pvl(order) == "CABFDE"
+    assert seconds == 15
+
+
+def test_long_names():
+    dag = DAG(parse_data([
+        "Step build must be finished before step test can begin.",
+        "Step fetch must be finished before step build can begin.",
+        "Step fetch must be finished before step docs can begin.",
+        "Step docs must be finished before step test can begin."
+    ]))
+
+    assert [str(v) for v in dag.stepping_order()] == [
+        "fetch", "build", "docs", "test"
+    ]
+
+
+def test_cycle():
+    dag = DAG([("A", "B"), ("B", "C"), ("C", "B")])
+
+    with pytest.raises(ValueError):
+        dag.stepping_order()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_dag(seed):
+    rng = random.Random(seed)
+    names = [f"T{i:03}" for i in range(200)]
+    rng.shuffle(names)
+    edges = [
+        (names[i], names[j])
+        for i in range(len(names))
+        for j in range(i + 1, min(i + 6, len(names)))
+        if rng.random() < 0.5
+    ]
+    dag = DAG(edges)
+    order = [str(v) for v in dag.stepping_order()]
+
+    position = {name: index for (index, name) in enumerate(order)}
+    assert sorted(order) == sorted({name for edge in edges for name in edge})
+    assert all(position[a] < position[b] for (a, b) in edges)
+
+
+def test_weight(monkeypatch):
+    monkeypatch.setattr(day7, "FIXED_TASK_COST", 60)
+
+    assert day7.weight("A") == 61
+    assert day7.weight("Z") == 86
+    assert day7.weight("AA") == 87
+    with pytest.raises(ValueError):
+        day7.weight("build")
+
+
+def ticking_schedule(dag, concurrency):
+    """
+    Per-second simulation: free workers take the alphabetically first ready
+    tasks, and tasks finishing in the same second complete in worker order.
+    """
+    waiting = {vertex: len(dag.prereqs[vertex]) for vertex in dag.vertexes}
+    ready = sorted(vertex.task for vertex in dag.vertexes if not waiting[vertex])
+    by_name = {vertex.task: vertex for vertex in dag.vertexes}
+    workers = [None] * concurrency
+    (order, ticks) = ([], 0)
+    while ready or any(workers):
+        for index in range(concurrency):
+            if workers[index] is None and ready:
+                name = ready.pop(0)
+                workers[index] = [name, by_name[name].cost]
+        ticks += 1
+        for index, job in enumerate(workers):
+            if job is None:
+                continue
+            job[1] -= 1
+            if not job[1]:
+                order.append(job[0])
+                workers[index] = None
+                for vertex in dag.graph.get(by_name[job[0]], ()):
+                    waiting[vertex] -= 1
+                    if not waiting[vertex]:
+                        ready.append(vertex.task)
+                ready.sort()
+
+    return (order, ticks)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_event_driven_matches_ticking(seed, monkeypatch):
+    rng = random.Random(seed)
+    monkeypatch.setattr(day7, "FIXED_TASK_COST", rng.randint(0, 20))
+    names = [chr(ord("A") + i) for i in range(26)]
+    edges = [
+        (names[i], names[j])
+        for i in range(26)
+        for j in range(i + 1, 26)
+        if rng.random() < 0.15
+    ]
+    dag = DAG(edges)
+    concurrency = rng.randint(1, 6)
+    (order, ticks) = dag.stepping_order_p2(concurrency)
+
+    assert ([str(v) for v in order], ticks) == ticking_schedule(dag, concurrency)
+
+
+def test_long_tasks(monkeypatch):
+    monkeypatch.setattr(day7, "FIXED_TASK_COST", 10 ** 9)
+    dag = DAG(parse_data(TEST_DATA))
+    (order, seconds) = dag.stepping_order_p2(2)
+
+    assert pvl(order) == "CAFBDE"
+    assert seconds == 4 * 10 ** 9 + 18
+
+
+def test_cost_function():
+    dag = DAG(parse_data(TEST_DATA))
+    (order, seconds) = dag.stepping_order_p2(2, partial(day7.weight, fixed=0))
+
+    assert pvl(order) == "CABFDE"
+    assert seconds == 15
+    assert dag.critical_path(partial(day7.weight, fixed=0)) == 3 + 6 + 5
+    assert dag.lower_bound(1, partial(day7.weight, fixed=0)) == 21
+
+
+def test_policies():
+    # Z heads the longest chain, but comes last alphabetically.
+    dag = DAG([("A", "B"), ("Z", "Y")])
+    dag.vertexes.add(day7.Vertex("C"))
+    costs = {"A": 1, "B": 1, "C": 1, "Y": 5, "Z": 5}
+
+    (order, seconds) = dag.stepping_order_p2(2, costs.__getitem__)
+    assert (pvl(order), seconds) == ("ACBZY", 11)
+
+    (order, seconds) = dag.stepping_order_p2(
+        2, costs.__getitem__, CriticalPathFirst()
+    )
+    assert (pvl(order), seconds) == ("ABCZY", 10)
+
+    (order, seconds) = dag.stepping_order_p2(
+        2, costs.__getitem__, LongestFirst()
+    )
+    assert seconds == 10
+    assert dag.lower_bound(2, costs.__getitem__) == 10
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_policies_respect_lower_bound(seed):
+    rng = random.Random(seed)
+    names = [f"T{i:03}" for i in range(300)]
+    edges = [
+        (names[i], names[j])
+        for i in range(len(names))
+        for j in range(i + 1, min(i + 20, len(names)))
+        if rng.random() < 0.1
+    ]
+    costs = {name: rng.randint(1, 100) for name in names}
+    dag = DAG(edges)
+    bound = dag.lower_bound(4, costs.__getitem__)
+
+    for policy in (Alphabetical(), LongestFirst(), CriticalPathFirst()):
+        (order, seconds) = dag.stepping_order_p2(4, costs.__getitem__, policy)
+        position = {str(v): index for (index, v) in enumerate(order)}
+        assert all(position[a] < position[b] for (a, b) in edges)
+        assert seconds >= bound
+
+
+def test_policy_is_abstract():
+    with pytest.raises(TypeError):
+        Policy()
@@ -0,0 +1,87 @@
+import random
+
+import pytest  # type: ignore
+
+from day8 import (
+    DataProvider, FlatTree, Node, evaluate, read_tokens
+)
+
+TEST_DATA = [2, 3, 0, 3, 10, 11, 12, 1, 1, 0, 1, 99, 2, 1, 1, 2]
+
+
+def random_tree(rng, depth):
+    children = rng.randint(0, 3) if depth else 0
+    data = [children, rng.randint(1, 3)]
+    for _ in range(children):
+        data.extend(random_tree(rng, depth - 1))
+    data.extend(rng.randint(0, 4) for _ in range(data[1]))
+    return data
+
+
+def chain(depth):
+    """
+    A tree with each node having a single child, depth nodes deep.
+    """
+    return [1, 1] * (depth - 1) + [0, 1, 5] + [1] * (depth - 1)
+
+
+def test_sample_data():
+    tree = FlatTree(TEST_DATA)
+
+    assert tree.meta_sum() == 138
+    assert tree.value() == 66
+    assert list(tree.node_children(0)) == [1, 2]
+    assert list(tree.metadata(2)) == [2]
+    assert tree.value(1) == 33
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_nodes(seed):
+    data = random_tree(random.Random(seed), 5)
+    tree = FlatTree(data)
+    node = Node.make_node(DataProvider(data))
+
+    assert tree.meta_sum() == node.meta_sum()
+    assert tree.value() == node.value()
+
+
+def test_deep_tree():
+    tree = FlatTree(chain(100_000))
+
+    assert tree.meta_sum() == 5 + 99_999
+    assert tree.value() == 5
+
+
+def test_truncated():
+    with pytest.raises(ValueError):
+        FlatTree(TEST_DATA[:-1])
+    with pytest.raises(ValueError):
+        FlatTree([1, 1, 0])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_evaluate(seed):
+    data = random_tree(random.Random(seed), 5)
+    tree = FlatTree(data)
+
+    assert evaluate(data) == (tree.meta_sum(), tree.value())
+
+
+def test_evaluate_deep():
+    assert evaluate(chain(100_000)) == (5 + 99_999, 5)
+
+
+def test_evaluate_truncated():
+    with pytest.raises(ValueError):
+        evaluate(TEST_DATA[:-1])
+    with pytest.raises(ValueError):
+        evaluate([1, 1, 0])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_read_tokens(tmp_path, chunk_size):
+    path = tmp_path / "input8.data"
+    path.write_text(" ".join(str(n) for n in TEST_DATA) + "\n")
+
+    assert list(read_tokens(str(path), chunk_size)) == TEST_DATA
+    assert evaluate(read_tokens(str(path), chunk_size)) == (138, 66)
@@ -0,0 +1,67 @@
+import pytest  # type: ignore
+
+from parsing import decode, ints, mmap_lines, read_ints, rows, to_int
+
+
+@pytest.mark.parametrize(
+    "data,stride,expected",
+    [
+        ("pos=<0,0,0>, r=4\npos=<1,-1,0>, r=1", None, [0, 0, 0, 4, 1, -1, 0, 1]),
+        (b"1,-7,1,1\n-3,4,3,4\n", None, [1, -7, 1, 1, -3, 4, 3, 4]),
+        (["x=495, y=2..7", "y=7, x=495..501"], None, [495, 2, 7, 7, 495, 501]),
+        ("Before: [3, 2, 1, 1]\n9 2 1 2\nAfter:  [3, 2, 2, 1]\n", 12,
+         [3, 2, 1, 1, 9, 2, 1, 2, 3, 2, 2, 1]),
+    ]
+)
+def test_ints(data, stride, expected):
+    (values, found_stride) = ints(data, stride)
+
+    assert list(values) == expected
+    assert len(values) % found_stride == 0
+
+
+def test_ints_infers_stride():
+    assert ints("1 2 3\n4 5 6\n")[1] == 3
+    assert ints(b"1 2 3\n4 5 6")[1] == 3
+    assert ints("1 2 3")[1] == 3
+
+
+def test_ints_ragged():
+    with pytest.raises(ValueError):
+        ints("1 2 3\n4 5\n")
+
+
+def test_read_ints(tmp_path):
+    data = tmp_path / "input.data"
+    data.write_text("position=< 9,  1> velocity=< 0,  2>\n"
+                    "position=< 7,  0> velocity=<-1,  0>\n")
+
+    assert rows(*read_ints(str(data))) == [(9, 1, 0, 2), (7, 0, -1, 0)]
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        (b"+15\n-7\n+16\n", [15, -7, 16]),
+        (b"+15\r\n-7\r\n+16", [15, -7, 16]),
+        (b"", [])
+    ]
+)
+def test_mmap_lines(tmp_path, content, expected):
+    data = tmp_path / "input.data"
+    data.write_bytes(content)
+
+    assert list(mmap_lines(str(data), to_int)) == expected
+
+
+def test_mmap_lines_releases(tmp_path):
+    data = tmp_path / "input.data"
+    data.write_bytes(b"abcde\nfghij\n")
+
+    lines = mmap_lines(str(data))
+    first = next(lines)
+    assert decode(first) == "abcde"
+    assert decode(next(lines)) == "fghij"
+
+    with pytest.raises(ValueError):
+        bytes(first)